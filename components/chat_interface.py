@@ -5,7 +5,7 @@ from utils.career_qa_system import CareerQASystem
 
 class ChatInterface:
     def __init__(self):
-        self.text_processor = TextProcessor()
+        self.text_processor = TextProcessor(mode='fast')
         self.qa_system = CareerQASystem()
         
     def render(self):
@@ -33,11 +33,12 @@ class ChatInterface:
     
     def _process_user_message(self, prompt):
         """Process user message and generate response"""
-        # Enhanced NLP processing
-        keywords = self.text_processor.extract_keywords(prompt)
-        question_type = self.text_processor.get_question_type(prompt)
-        sentiment = self.text_processor.get_text_sentiment(prompt)
-        career_terms = self.text_processor.extract_career_related_terms(prompt)
+        # Enhanced NLP processing, analyzing the message once for all extractors
+        message = self.text_processor.analyze(prompt)
+        keywords = self.text_processor.extract_keywords(message)
+        question_type = self.text_processor.get_question_type(message)
+        sentiment = self.text_processor.get_text_sentiment(message)
+        career_terms = self.text_processor.extract_career_related_terms(message)
         
         # Update user profile with extracted information
         if 'chat_keywords' not in st.session_state.user_profile:
@@ -55,8 +56,7 @@ class ChatInterface:
         # Generate intelligent response based on question type
         if question_type in ['question', 'information_request']:
             # Use career Q&A system for questions
-            question_analysis = self.qa_system.analyze_question(prompt)
-            response = self.qa_system.generate_answer(question_analysis)
+            _, response = self.qa_system.answer_question(prompt)
         else:
             # Use conversational response for statements
             response = self._generate_response(prompt, keywords, sentiment, career_terms)
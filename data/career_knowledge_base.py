@@ -1,3 +1,7 @@
+import re
+import json
+import hashlib
+
 # Comprehensive career knowledge base with real career information
 CAREER_KNOWLEDGE_BASE = {
     "technology": {
@@ -168,15 +172,90 @@ INDUSTRY_TRENDS = {
     ]
 }
 
-def get_career_info(career_name):
-    """Get detailed information about a specific career"""
-    career_name = career_name.lower().replace(" ", "_")
+# Alternative names -> knowledge base key, for careers users commonly call something else
+CAREER_ALIASES = {
+    "nurse": "registered_nurse",
+    "rn": "registered_nurse",
+    "teacher": "elementary_teacher",
+    "elementary_school_teacher": "elementary_teacher",
+    "programmer": "software_developer",
+    "software_engineer": "software_developer",
+    "cybersecurity": "cybersecurity_analyst",
+    "security_analyst": "cybersecurity_analyst",
+    "physiotherapist": "physical_therapist",
+    "copywriter": "content_writer",
+}
+
+_SEPARATORS = re.compile(r"[\s\-]+")
+_SKILL_TOKEN = re.compile(r"[a-z0-9+#]+")
+
+def normalize_career_name(career_name):
+    """Knowledge base key form of a career name: lower case, words joined by underscores"""
+    return _SEPARATORS.sub("_", career_name.strip().lower())
+
+def skill_tokens(skill):
+    """Lower-case word tokens of a skill name"""
+    return _SKILL_TOKEN.findall(skill.lower())
+
+def build_career_indexes(knowledge_base=None, aliases=None):
+    """Build the name and skill indexes over a knowledge base
+
+    Returns (careers, career_index, skill_index):
+      careers lists (key, category, record) in knowledge base order
+      career_index maps every normalized career name and alias to its careers entry
+      skill_index maps every prefix of every skill token to the set of
+      (career position, skill number) pairs having such a token
+    """
+    knowledge_base = CAREER_KNOWLEDGE_BASE if knowledge_base is None else knowledge_base
+    aliases = CAREER_ALIASES if aliases is None else aliases
+
+    careers = [
+        (career_key, category, career_info)
+        for category, category_careers in knowledge_base.items()
+        for career_key, career_info in category_careers.items()
+    ]
     
-    for category, careers in CAREER_KNOWLEDGE_BASE.items():
-        if career_name in careers:
-            return careers[career_name]
+    career_index = {}
+    skill_index = {}
+    for position, entry in enumerate(careers):
+        career_key, category, career_info = entry
+        career_index[normalize_career_name(career_key)] = entry
+        
+        for skill_number, skill in enumerate(career_info.get("skills_required", [])):
+            for token in skill_tokens(skill):
+                for end in range(1, len(token) + 1):
+                    skill_index.setdefault(token[:end], set()).add((position, skill_number))
     
-    return None
+    # Aliases never shadow a real career key
+    for alias, career_key in aliases.items():
+        target = career_index.get(normalize_career_name(career_key))
+        if target is not None:
+            career_index.setdefault(normalize_career_name(alias), target)
+    
+    return careers, career_index, skill_index
+
+def compute_knowledge_base_version():
+    """Short content hash of the knowledge base, aliases, courses and trends"""
+    content = json.dumps(
+        [CAREER_KNOWLEDGE_BASE, CAREER_ALIASES, COURSE_INFORMATION, INDUSTRY_TRENDS], sort_keys=True
+    )
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()[:12]
+
+def refresh_knowledge_base():
+    """Rebuild the indexes and version after the knowledge base dictionaries were edited"""
+    global INDEXED_CAREERS, CAREER_INDEX, SKILL_INDEX, KNOWLEDGE_BASE_VERSION
+    INDEXED_CAREERS, CAREER_INDEX, SKILL_INDEX = build_career_indexes()
+    KNOWLEDGE_BASE_VERSION = compute_knowledge_base_version()
+    return KNOWLEDGE_BASE_VERSION
+
+# Built once at import; call refresh_knowledge_base() after editing the knowledge base
+INDEXED_CAREERS, CAREER_INDEX, SKILL_INDEX = build_career_indexes()
+KNOWLEDGE_BASE_VERSION = compute_knowledge_base_version()
+
+def get_career_info(career_name):
+    """Get detailed information about a specific career"""
+    entry = CAREER_INDEX.get(normalize_career_name(career_name))
+    return entry[2] if entry is not None else None
 
 def get_course_info(course_name):
     """Get detailed information about a specific course"""
@@ -198,18 +277,23 @@ def get_industry_trends(industry):
 
 def search_careers_by_skill(skill):
     """Find careers that require a specific skill"""
-    matching_careers = []
-    skill = skill.lower()
+    # A career matches when one of its skills has a word starting with every word of the query
+    tokens = skill_tokens(skill)
+    if not tokens:
+        return []
     
-    for category, careers in CAREER_KNOWLEDGE_BASE.items():
-        for career_name, career_info in careers.items():
-            skills = [s.lower() for s in career_info.get("skills_required", [])]
-            if any(skill in s for s in skills):
-                matching_careers.append({
-                    "name": career_name.replace("_", " ").title(),
-                    "category": category,
-                    "description": career_info["description"]
-                })
+    matches = SKILL_INDEX.get(tokens[0], set())
+    for token in tokens[1:]:
+        matches = matches & SKILL_INDEX.get(token, set())
+    
+    matching_careers = []
+    for position in sorted({position for position, skill_number in matches}):
+        career_name, category, career_info = INDEXED_CAREERS[position]
+        matching_careers.append({
+            "name": career_name.replace("_", " ").title(),
+            "category": category,
+            "description": career_info["description"]
+        })
     
     return matching_careers
 
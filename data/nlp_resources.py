@@ -0,0 +1,68 @@
+# Offline NLP resources for the fast text processing mode (no NLTK downloads needed)
+
+# English stopwords (same word list as the NLTK stopwords corpus)
+STOP_WORDS = frozenset([
+    'i', 'me', 'my', 'myself', 'we', 'our', 'ours', 'ourselves', 'you', "you're",
+    "you've", "you'll", "you'd", 'your', 'yours', 'yourself', 'yourselves', 'he',
+    'him', 'his', 'himself', 'she', "she's", 'her', 'hers', 'herself', 'it', "it's",
+    'its', 'itself', 'they', 'them', 'their', 'theirs', 'themselves', 'what', 'which',
+    'who', 'whom', 'this', 'that', "that'll", 'these', 'those', 'am', 'is', 'are',
+    'was', 'were', 'be', 'been', 'being', 'have', 'has', 'had', 'having', 'do',
+    'does', 'did', 'doing', 'a', 'an', 'the', 'and', 'but', 'if', 'or', 'because',
+    'as', 'until', 'while', 'of', 'at', 'by', 'for', 'with', 'about', 'against',
+    'between', 'into', 'through', 'during', 'before', 'after', 'above', 'below', 'to',
+    'from', 'up', 'down', 'in', 'out', 'on', 'off', 'over', 'under', 'again',
+    'further', 'then', 'once', 'here', 'there', 'when', 'where', 'why', 'how', 'all',
+    'any', 'both', 'each', 'few', 'more', 'most', 'other', 'some', 'such', 'no',
+    'nor', 'not', 'only', 'own', 'same', 'so', 'than', 'too', 'very', 's', 't',
+    'can', 'will', 'just', 'don', "don't", 'should', "should've", 'now', 'd', 'll',
+    'm', 'o', 're', 've', 'y', 'ain', 'aren', "aren't", 'couldn', "couldn't",
+    'didn', "didn't", 'doesn', "doesn't", 'hadn', "hadn't", 'hasn', "hasn't",
+    'haven', "haven't", 'isn', "isn't", 'ma', 'mightn', "mightn't", 'mustn',
+    "mustn't", 'needn', "needn't", 'shan', "shan't", 'shouldn', "shouldn't", 'wasn',
+    "wasn't", 'weren', "weren't", 'won', "won't", 'wouldn', "wouldn't"
+])
+
+# Irregular noun forms and their lemmas (as returned by the WordNet lemmatizer)
+LEMMA_EXCEPTIONS = {
+    'analyses': 'analysis',
+    'bases': 'basis',
+    'children': 'child',
+    'crises': 'crisis',
+    'criteria': 'criterion',
+    'data': 'datum',
+    'feet': 'foot',
+    'geese': 'goose',
+    'hypotheses': 'hypothesis',
+    'lives': 'life',
+    'media': 'medium',
+    'men': 'man',
+    'mice': 'mouse',
+    'phenomena': 'phenomenon',
+    'teeth': 'tooth',
+    'theses': 'thesis',
+    'wives': 'wife',
+    'women': 'woman',
+}
+
+# Words that end in "s" but are already lemmas
+INVARIANT_LEMMAS = frozenset([
+    'always', 'analysis', 'arts', 'athletics', 'basis', 'bus', 'business', 'chaos',
+    'christmas', 'crisis', 'economics', 'electronics', 'emphasis', 'focus', 'genius',
+    'graphics', 'gymnastics', 'linguistics', 'mathematics', 'news', 'physics',
+    'politics', 'process', 'progress', 'series', 'species', 'statistics', 'status',
+    'success', 'thesis', 'various', 'yes'
+])
+
+# Regular noun plural suffixes and their singular replacements, most specific first
+PLURAL_SUFFIX_RULES = [
+    ('ies', 'y'),
+    ('sses', 'ss'),
+    ('ches', 'ch'),
+    ('shes', 'sh'),
+    ('xes', 'x'),
+    ('s', ''),
+]
+
+# Endings of words that look plural but are not
+NON_PLURAL_ENDINGS = ('ss', 'us', 'is')
@@ -0,0 +1,116 @@
+import numpy as np
+from utils.feature_encoder import pack_features, popcount
+
+# Minkowski-family metrics, all monotonic in the Hamming distance for binary vectors
+BINARY_METRIC_POWERS = {
+    'euclidean': 2.0,
+    'manhattan': 1.0,
+    'cityblock': 1.0,
+    'l1': 1.0,
+    'l2': 2.0,
+}
+
+# Query rows compared with the whole training set at once, as in sklearn's chunked
+# pairwise search; bounds the XOR and distance blocks to a few megabytes
+KNN_BLOCK_ROWS = 512
+
+
+def metric_power(metric, p=2):
+    """Exponent p such that the metric equals hamming ** (1 / p) on binary vectors"""
+    if metric == 'minkowski':
+        return float(p)
+    if metric in BINARY_METRIC_POWERS:
+        return BINARY_METRIC_POWERS[metric]
+    raise ValueError(f"Metric {metric!r} cannot be evaluated on bit-packed vectors")
+
+
+class BitKNNClassifier:
+    """k-nearest-neighbours over bit-packed binary training vectors, one XOR and popcount per pair"""
+
+    def __init__(self, packed_fit_X, fit_y, classes, n_neighbors=5, weights='uniform', power=2.0):
+        if weights not in ('uniform', 'distance'):
+            raise ValueError(f"Unsupported neighbour weighting: {weights}")
+
+        self.packed_fit_X = np.ascontiguousarray(packed_fit_X, dtype=np.uint64)
+        self.fit_y = np.ascontiguousarray(fit_y, dtype=np.int32)
+        self.classes_ = np.asarray(classes)
+        self.n_neighbors = min(int(n_neighbors), len(self.packed_fit_X))
+        self.weights = weights
+        self.power = float(power)
+
+    @classmethod
+    def from_model(cls, model):
+        """Return model unchanged if already converted, otherwise pack a fitted KNeighborsClassifier"""
+        if isinstance(model, cls):
+            return model
+
+        fit_X = np.asarray(model._fit_X)
+        if not np.isin(fit_X, (0, 1)).all():
+            raise ValueError("Only binary training vectors can be bit-packed")
+        if not isinstance(model.weights, str):
+            raise ValueError("Callable neighbour weights cannot be exported")
+
+        return cls(
+            pack_features(fit_X), np.asarray(model._y), model.classes_,
+            model.n_neighbors, model.weights, metric_power(model.metric, model.p)
+        )
+
+    @classmethod
+    def from_compact(cls, compact):
+        """Build a classifier from a knn_bits compact export, reusing its memory-mapped arrays"""
+        arrays = compact.arrays
+        attributes = compact.attributes
+        return cls(
+            arrays['packed_fit_X'], arrays['fit_y'], arrays['classes'],
+            attributes['n_neighbors'], attributes['weights'], attributes['power']
+        )
+
+    def kneighbors(self, X):
+        """(hamming distances, training indices) of the nearest neighbours of every row, nearest first"""
+        packed = np.atleast_1d(pack_features(X))
+        distances = np.empty((len(packed), self.n_neighbors), dtype=np.int32)
+        indices = np.empty((len(packed), self.n_neighbors), dtype=np.intp)
+
+        for start in range(0, len(packed), KNN_BLOCK_ROWS):
+            block = slice(start, start + KNN_BLOCK_ROWS)
+            distances[block], indices[block] = self._block_kneighbors(packed[block])
+
+        return distances, indices
+
+    def _block_kneighbors(self, packed):
+        """kneighbors of one block of packed query rows"""
+        # Hamming distance equals the squared euclidean distance sklearn ranks binary vectors by.
+        # int32 rather than uint8: numpy selects among equal 8- and 16-bit values differently
+        # than among the float64 distances sklearn partitions
+        distances = popcount(packed[:, None] ^ self.packed_fit_X[None, :]).astype(np.int32)
+
+        # Same selection as sklearn's brute-force search, so equidistant neighbours are picked alike
+        indices = np.argpartition(distances, self.n_neighbors - 1, axis=1)[:, :self.n_neighbors]
+        nearest = np.take_along_axis(distances, indices, axis=1)
+        order = np.argsort(nearest, axis=1)
+
+        return np.take_along_axis(nearest, order, axis=1), np.take_along_axis(indices, order, axis=1)
+
+    def predict_proba(self, X):
+        """Class probabilities for a batch: the (weighted) share of each class among the neighbours"""
+        distances, indices = self.kneighbors(X)
+        labels = self.fit_y[indices]
+
+        if self.weights == 'uniform':
+            neighbor_weights = np.ones(labels.shape)
+        else:
+            # Exact matches take all the weight, as in sklearn
+            with np.errstate(divide='ignore'):
+                neighbor_weights = 1.0 / distances.astype(np.float64) ** (1.0 / self.power)
+            exact = distances == 0
+            has_exact = exact.any(axis=1)
+            neighbor_weights[has_exact] = exact[has_exact]
+
+        proba = np.zeros((len(labels), len(self.classes_)))
+        np.add.at(proba, (np.arange(len(labels))[:, None], labels), neighbor_weights)
+        proba /= proba.sum(axis=1, keepdims=True)
+        return proba
+
+    def predict(self, X):
+        """Most probable class label for every row of a batch"""
+        return self.classes_[self.predict_proba(X).argmax(axis=1)]
@@ -0,0 +1,148 @@
+"""
+Export trained models to the compact array format (see models/compact_format.py).
+
+Usage:
+    python -m models.compact_export [--output models/compact] [name ...]
+"""
+import os
+import sys
+import json
+import argparse
+import numpy as np
+from models.model_registry import get_registry, PROJECT_ROOT, ARTIFACT_LOADERS
+from models.compact_format import COMPACT_DIR, COMPACT_FORMAT_VERSION
+from models.numpy_network import DenseNetwork
+from models.tree_evaluator import flatten_trees
+from models.linear_classifier import LinearClassifier
+from models.bit_knn import BitKNNClassifier
+
+
+def _describe(model):
+    """Return (kind, arrays, attributes) for a supported model"""
+    class_name = type(model).__name__
+
+    if isinstance(model, DenseNetwork):
+        arrays = {}
+        for i, (kernel, bias, activation) in enumerate(model.layers):
+            arrays[f'kernel_{i}'] = kernel
+            arrays[f'bias_{i}'] = bias
+        activations = [activation for kernel, bias, activation in model.layers]
+        return 'dense_network', arrays, {'activations': activations}
+
+    if class_name in ('DecisionTreeClassifier', 'RandomForestClassifier', 'ExtraTreesClassifier'):
+        estimators = getattr(model, 'estimators_', [model])
+        # Includes the step arrays the evaluator walks, so loading maps them instead of deriving them per process
+        arrays = flatten_trees(estimators)
+        arrays['classes'] = np.asarray(model.classes_)
+        return 'tree_ensemble', arrays, {'n_features': int(model.n_features_in_)}
+
+    if class_name in ('LogisticRegression', 'GaussianNB'):
+        # Store the final X @ W + b form, so loading maps it as-is instead of deriving it per process
+        classifier = LinearClassifier.from_model(model)
+        arrays = {
+            'weights': classifier.weights,
+            'bias': classifier.bias,
+            'classes': classifier.classes_,
+        }
+        return 'linear_classifier', arrays, {'source_model': class_name}
+
+    if class_name == 'KNeighborsClassifier':
+        classifier = BitKNNClassifier.from_model(model)
+        arrays = {
+            'packed_fit_X': classifier.packed_fit_X,
+            'fit_y': classifier.fit_y,
+            'classes': classifier.classes_,
+        }
+        attributes = {
+            'n_neighbors': classifier.n_neighbors,
+            'weights': classifier.weights,
+            'power': classifier.power,
+        }
+        return 'knn_bits', arrays, attributes
+
+    if class_name in ('LabelEncoder', 'MultiLabelBinarizer'):
+        # Labels are strings, which cannot be memory-mapped, so they live in the metadata
+        attributes = {
+            'classes': [str(label) for label in model.classes_],
+            'multilabel': class_name == 'MultiLabelBinarizer',
+        }
+        return 'labels', {}, attributes
+
+    raise ValueError(f"Unsupported model type for compact export: {class_name}")
+
+
+def export_model(model, output_dir, source=None, source_version=None):
+    """Write a model to output_dir as meta.json plus one .npy file per array"""
+    kind, arrays, attributes = _describe(model)
+    os.makedirs(output_dir, exist_ok=True)
+
+    # Write to temporary files and rename, so processes mapping the old files keep a valid copy
+    for array_name, array in arrays.items():
+        array_path = os.path.join(output_dir, f"{array_name}.npy")
+        with open(array_path + ".tmp", 'wb') as f:
+            np.save(f, np.ascontiguousarray(array), allow_pickle=False)
+        os.replace(array_path + ".tmp", array_path)
+
+    meta = {
+        'format_version': COMPACT_FORMAT_VERSION,
+        'kind': kind,
+        'source': source,
+        'source_version': source_version,
+        'arrays': sorted(arrays),
+        'attributes': attributes,
+    }
+    meta_path = os.path.join(output_dir, "meta.json")
+    with open(meta_path + ".tmp", 'w') as f:
+        json.dump(meta, f, indent=2)
+    os.replace(meta_path + ".tmp", meta_path)
+
+    return meta
+
+
+def export_registry(output_dir=COMPACT_DIR, names=None, registry=None):
+    """Export every supported registry artifact (or the given names); returns {name: kind or error}"""
+    registry = registry if registry is not None else get_registry()
+    results = {}
+
+    for name in names or registry.available():
+        artifact = registry.get_artifact(name)
+        if artifact is None:
+            results[name] = "error: not found"
+            continue
+
+        try:
+            # Always export from the source file, never from an existing compact copy
+            model = ARTIFACT_LOADERS[artifact.extension](artifact.path)
+        except Exception as e:
+            results[name] = f"error: {e}"
+            continue
+
+        try:
+            meta = export_model(
+                model,
+                os.path.join(output_dir, name),
+                source=os.path.relpath(artifact.path, PROJECT_ROOT),
+                source_version=artifact.version
+            )
+            results[name] = meta['kind']
+        except ValueError as e:
+            results[name] = f"skipped: {e}"
+
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export trained models to the memory-mappable compact format")
+    parser.add_argument('names', nargs='*', help="registry artifact names (default: all)")
+    parser.add_argument('--output', default=COMPACT_DIR, help="directory to write exported models to")
+    args = parser.parse_args(argv)
+
+    results = export_registry(args.output, args.names or None)
+    for name, outcome in sorted(results.items()):
+        print(f"{name}: {outcome}")
+
+    return 0 if all(not outcome.startswith('error') for outcome in results.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
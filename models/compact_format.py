@@ -0,0 +1,51 @@
+"""
+Compact on-disk format for trained models.
+
+Each model is a directory holding one .npy file per array plus a meta.json
+describing how to rebuild it. Loading maps the arrays read-only with
+np.memmap, so server processes share one physical copy and nothing is
+unpickled at startup.
+"""
+import os
+import json
+import numpy as np
+
+COMPACT_FORMAT_VERSION = 2
+
+COMPACT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "compact")
+
+
+class CompactModel:
+    """A model exported to the compact format, with its arrays memory-mapped read-only"""
+
+    def __init__(self, path, meta, arrays):
+        self.path = path
+        self.meta = meta
+        self.arrays = arrays
+
+    @property
+    def kind(self):
+        return self.meta['kind']
+
+    @property
+    def attributes(self):
+        return self.meta.get('attributes', {})
+
+    @property
+    def source_version(self):
+        return self.meta.get('source_version')
+
+
+def load_compact(path):
+    """Open an exported model, memory-mapping its arrays read-only"""
+    with open(os.path.join(path, "meta.json")) as f:
+        meta = json.load(f)
+
+    if meta.get('format_version') != COMPACT_FORMAT_VERSION:
+        raise ValueError(f"Unsupported compact format version: {meta.get('format_version')}")
+
+    arrays = {
+        array_name: np.load(os.path.join(path, f"{array_name}.npy"), mmap_mode='r', allow_pickle=False)
+        for array_name in meta['arrays']
+    }
+    return CompactModel(path, meta, arrays)
@@ -0,0 +1,226 @@
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from models.model_loader import ModelLoader
+from models.model_registry import get_registry
+
+# Soft-voting weight of each course engine; engines left out or weighted 0 do not vote
+DEFAULT_ENGINE_WEIGHTS = {
+    'random_forest': 1.0,
+    'neural_network': 1.0,
+    'knn': 1.0,
+    'decision_tree': 1.0,
+    'naive_bayes': 1.0,
+    'logistic_regression': 1.0,
+}
+
+
+class CourseEnsemble:
+    """Scores a batch with every available course engine in parallel and combines them by weighted soft voting"""
+
+    def __init__(self, weights=None, registry=None, max_workers=None):
+        weights = dict(DEFAULT_ENGINE_WEIGHTS if weights is None else weights)
+        unknown = set(weights) - set(ModelLoader.COURSE_ENGINES)
+        if unknown:
+            raise ValueError(f"Unknown course engines: {', '.join(sorted(unknown))}")
+
+        self.weights = {engine: float(weight) for engine, weight in weights.items() if weight > 0}
+        self.registry = registry if registry is not None else get_registry()
+        self.loaders = {
+            engine: ModelLoader(registry=self.registry, course_engine=engine) for engine in self.weights
+        }
+        self.max_workers = max_workers or len(self.weights) or 1
+        self._executor = None
+        self._lock = threading.Lock()
+        self._stats = {engine: self._new_engine_stats() for engine in self.weights}
+
+    def _new_engine_stats(self):
+        return {'calls': 0, 'rows': 0, 'errors': 0, 'total_latency_ms': 0.0, 'agreeing_rows': 0}
+
+    @property
+    def executor(self):
+        """Thread pool shared by all scoring calls; NumPy releases the GIL inside matrix products"""
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers, thread_name_prefix="course-ensemble"
+                    )
+        return self._executor
+
+    def available_engines(self):
+        """Weighted engines whose model artifact exists on disk"""
+        return [
+            engine for engine in self.weights
+            if self.registry.get_artifact(ModelLoader.COURSE_ENGINES[engine]) is not None
+        ]
+
+    def course_labels(self):
+        """Course names of the shared label space the engines vote over"""
+        encoder = self.registry.load(ModelLoader.COURSE_ENCODER)
+        if encoder is None:
+            raise ValueError("Course label encoder is not available")
+        return encoder.classes_
+
+    def version(self):
+        """Content hash of the weighted models and their weights, for cache keys"""
+        parts = [
+            f"{engine}={self.weights[engine]}:{self.loaders[engine].model_version()}"
+            for engine in sorted(self.available_engines())
+        ]
+        return hashlib.sha256(";".join(parts).encode()).hexdigest()[:12]
+
+    def _load_engine(self, engine):
+        """(model, label encoder) of an engine straight from the registry
+
+        Runs on the worker threads, which have no Streamlit script context, so load
+        failures are raised into the report rather than shown with st.error.
+        """
+        name = ModelLoader.COURSE_ENGINES[engine]
+        wrapper = ModelLoader.COURSE_ENGINE_WRAPPERS.get(engine)
+        model = self.registry.load_derived(name, wrapper) if wrapper else self.registry.load(name)
+        if model is None:
+            raise ValueError(self.registry.errors.get(name, "model could not be loaded"))
+
+        encoder_name = ModelLoader.COURSE_ENGINE_ENCODERS.get(engine, ModelLoader.COURSE_ENCODER)
+        encoder = self.registry.load(encoder_name)
+        if encoder is None:
+            raise ValueError(self.registry.errors.get(encoder_name, "course encoder could not be loaded"))
+
+        return model, encoder
+
+    def _score_engine(self, engine, feature_matrix, label_index):
+        """Probabilities of one engine over the shared label space, plus its latency"""
+        start = time.perf_counter()
+        model, encoder = self._load_engine(engine)
+
+        proba = np.asarray(model.predict_proba(feature_matrix), dtype=np.float64)
+
+        # Engines may know a subset of the courses or use their own encoder; align columns by name
+        columns = [label_index[name] for name in encoder.classes_[np.asarray(model.classes_)]]
+        aligned = np.zeros((proba.shape[0], len(label_index)))
+        aligned[:, columns] = proba
+
+        return aligned, (time.perf_counter() - start) * 1000.0
+
+    def score(self, feature_matrix):
+        """Combined course probabilities for a batch and a report of each engine's latency and agreement
+
+        Engines that are missing or fail are left out of the vote; raises ValueError if none succeed.
+        """
+        feature_matrix = np.asarray(feature_matrix, dtype=np.float32)
+        if feature_matrix.ndim == 1:
+            feature_matrix = feature_matrix.reshape(1, -1)
+
+        labels = self.course_labels()
+        label_index = {name: i for i, name in enumerate(labels)}
+        engines = self.available_engines()
+
+        futures = {
+            engine: self.executor.submit(self._score_engine, engine, feature_matrix, label_index)
+            for engine in engines
+        }
+
+        # Engines without an artifact on disk are reported but never counted as failures
+        report = {
+            engine: {'weight': self.weights[engine], 'skipped': "model file not found"}
+            for engine in self.weights if engine not in futures
+        }
+        engine_proba = {}
+        for engine, future in futures.items():
+            try:
+                engine_proba[engine], latency_ms = future.result()
+                report[engine] = {'weight': self.weights[engine], 'latency_ms': latency_ms}
+            except Exception as e:
+                report[engine] = {'weight': self.weights[engine], 'error': str(e)}
+
+        if not engine_proba:
+            raise ValueError("No course engine could score the batch")
+
+        # Weighted soft vote, renormalized over the engines that succeeded
+        total_weight = sum(self.weights[engine] for engine in engine_proba)
+        combined = np.zeros((feature_matrix.shape[0], len(labels)))
+        for engine, proba in engine_proba.items():
+            combined += (self.weights[engine] / total_weight) * proba
+
+        consensus = combined.argmax(axis=1)
+        for engine, proba in engine_proba.items():
+            agreeing = proba.argmax(axis=1) == consensus
+            report[engine]['agreement'] = float(agreeing.mean())
+            report[engine]['agreeing_rows'] = int(agreeing.sum())
+
+        self._record(report, feature_matrix.shape[0])
+
+        return combined, report
+
+    def predict(self, feature_matrix):
+        """Consensus course name for every row of a batch, plus the per-engine report"""
+        combined, report = self.score(feature_matrix)
+        return list(self.course_labels()[combined.argmax(axis=1)]), report
+
+    def _record(self, report, n_rows):
+        """Accumulate one scoring call into the running per-engine statistics"""
+        with self._lock:
+            for engine, entry in report.items():
+                if 'skipped' in entry:
+                    continue
+                stats = self._stats[engine]
+                stats['calls'] += 1
+                if 'error' in entry:
+                    stats['errors'] += 1
+                    continue
+                stats['rows'] += n_rows
+                stats['total_latency_ms'] += entry['latency_ms']
+                stats['agreeing_rows'] += entry['agreeing_rows']
+
+    def stats(self):
+        """Per-engine call counts, mean latency and agreement with the consensus since startup"""
+        with self._lock:
+            summary = {}
+            for engine, stats in self._stats.items():
+                scored_calls = stats['calls'] - stats['errors']
+                summary[engine] = {
+                    'weight': self.weights[engine],
+                    'calls': stats['calls'],
+                    'errors': stats['errors'],
+                    'rows': stats['rows'],
+                    'mean_latency_ms': stats['total_latency_ms'] / scored_calls if scored_calls else 0.0,
+                    'agreement': stats['agreeing_rows'] / stats['rows'] if stats['rows'] else 0.0,
+                }
+            return summary
+
+    def shutdown(self):
+        """Stop the worker threads"""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+
+# Ensembles by their effective weights, so recommenders with equal weights share one thread pool
+MAX_SHARED_ENSEMBLES = 8
+_ensembles = OrderedDict()
+_ensemble_lock = threading.Lock()
+
+
+def _weights_key(weights):
+    return tuple(sorted((engine, float(weight)) for engine, weight in weights.items() if weight > 0))
+
+
+def get_course_ensemble(weights=None):
+    """Return the process-wide ensemble for a set of engine weights (default: DEFAULT_ENGINE_WEIGHTS)"""
+    key = _weights_key(DEFAULT_ENGINE_WEIGHTS if weights is None else weights)
+    with _ensemble_lock:
+        ensemble = _ensembles.get(key)
+        if ensemble is None:
+            ensemble = CourseEnsemble(dict(key))
+            _ensembles[key] = ensemble
+            # Evicted ensembles stay usable by their holders; their idle threads exit once unreferenced
+            while len(_ensembles) > MAX_SHARED_ENSEMBLES:
+                _ensembles.popitem(last=False)
+        else:
+            _ensembles.move_to_end(key)
+        return ensemble
@@ -0,0 +1,41 @@
+import numpy as np
+
+
+class LabelSet:
+    """Class labels of a fitted LabelEncoder or MultiLabelBinarizer, without sklearn or unpickling"""
+
+    def __init__(self, classes, multilabel=False):
+        # Labels are Python strings in an object array, exactly as the fitted encoders hold them
+        self.classes_ = np.empty(len(classes), dtype=object)
+        self.classes_[:] = list(classes)
+        self.multilabel = multilabel
+        self._index = {label: i for i, label in enumerate(self.classes_)}
+
+    @classmethod
+    def from_compact(cls, compact):
+        """Build the label set of a labels compact export"""
+        attributes = compact.attributes
+        return cls(attributes['classes'], attributes.get('multilabel', False))
+
+    def transform(self, labels):
+        """Label indices (LabelEncoder) or a binary indicator matrix (MultiLabelBinarizer)"""
+        if self.multilabel:
+            indicators = np.zeros((len(labels), len(self.classes_)), dtype=np.int64)
+            for row, row_labels in enumerate(labels):
+                indicators[row, [self._index[label] for label in row_labels]] = 1
+            return indicators
+
+        unknown = [label for label in labels if label not in self._index]
+        if unknown:
+            raise ValueError(f"y contains previously unseen labels: {unknown}")
+        return np.array([self._index[label] for label in labels], dtype=np.int64)
+
+    def inverse_transform(self, values):
+        """Labels of indices (LabelEncoder) or label tuples of indicator rows (MultiLabelBinarizer)"""
+        values = np.asarray(values)
+        if self.multilabel:
+            return [tuple(self.classes_[np.flatnonzero(row)]) for row in values]
+
+        if values.size and (values.min() < 0 or values.max() >= len(self.classes_)):
+            raise ValueError("y contains previously unseen labels")
+        return self.classes_[values.astype(np.intp)]
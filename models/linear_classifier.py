@@ -0,0 +1,112 @@
+import numpy as np
+
+
+def top_k_proba(proba, k):
+    """Column indices and probabilities of the k most probable classes per row, best first"""
+    proba = np.asarray(proba)
+    if proba.ndim == 1:
+        proba = proba.reshape(1, -1)
+    k = max(1, min(k, proba.shape[1]))
+
+    # Partition out the k best columns, then sort only those
+    if k < proba.shape[1]:
+        top = np.argpartition(-proba, k - 1, axis=1)[:, :k]
+    else:
+        top = np.tile(np.arange(proba.shape[1]), (proba.shape[0], 1))
+    top_proba = np.take_along_axis(proba, top, axis=1)
+    order = np.argsort(-top_proba, axis=1, kind='stable')
+
+    return np.take_along_axis(top, order, axis=1), np.take_along_axis(top_proba, order, axis=1)
+
+
+def _softmax_form(coef, intercept):
+    """(weights, bias) of a logistic regression given sklearn's coef_ and intercept_"""
+    coef = np.asarray(coef, dtype=np.float64)
+    intercept = np.asarray(intercept, dtype=np.float64)
+    if coef.shape[0] == 1:
+        # Binary models store one logit; softmax over (0, z) equals sigmoid(z)
+        coef = np.vstack([np.zeros_like(coef), coef])
+        intercept = np.concatenate([[0.0], intercept])
+    return coef.T, intercept
+
+
+def _gaussian_nb_form(theta, var, class_prior):
+    """(weights, bias) of Gaussian Naive Bayes over binary features, linear because x**2 == x"""
+    theta = np.asarray(theta, dtype=np.float64)
+    var = np.asarray(var, dtype=np.float64)
+
+    # log N(x; mu, var) summed over features, with (x - mu)**2 = x * (1 - 2 * mu) + mu**2
+    weights = -0.5 * (1.0 - 2.0 * theta) / var
+    bias = (np.log(np.asarray(class_prior, dtype=np.float64))
+            - 0.5 * np.sum(np.log(2.0 * np.pi * var) + theta ** 2 / var, axis=1))
+    return weights.T, bias
+
+
+class LinearClassifier:
+    """Classifier whose log-probabilities are X @ W + b, scored for a whole batch in one product"""
+
+    def __init__(self, weights, bias, classes):
+        # weights is (n_features, n_classes) so a batch is scored with X @ weights
+        self.weights = np.ascontiguousarray(weights, dtype=np.float64)
+        self.bias = np.ascontiguousarray(bias, dtype=np.float64)
+        self.classes_ = np.asarray(classes)
+
+    @classmethod
+    def from_logistic_regression(cls, model):
+        """Multinomial logistic regression: softmax(X @ coef.T + intercept)"""
+        if getattr(model, 'multi_class', 'auto') == 'ovr' and len(model.classes_) > 2:
+            raise ValueError("One-vs-rest logistic regression is not a single softmax")
+        return cls(*_softmax_form(model.coef_, model.intercept_), model.classes_)
+
+    @classmethod
+    def from_gaussian_nb(cls, model):
+        """Gaussian Naive Bayes; exact only for binary (0/1) feature vectors"""
+        return cls(*_gaussian_nb_form(model.theta_, model.var_, model.class_prior_), model.classes_)
+
+    @classmethod
+    def from_compact(cls, compact):
+        """Build a classifier from a linear_classifier compact export, reusing its memory-mapped arrays"""
+        arrays = compact.arrays
+        return cls(arrays['weights'], arrays['bias'], arrays['classes'])
+
+    @classmethod
+    def from_model(cls, model):
+        """Return model unchanged if already converted, otherwise extract its linear form"""
+        if isinstance(model, cls):
+            return model
+
+        class_name = type(model).__name__
+        if class_name == 'LogisticRegression':
+            return cls.from_logistic_regression(model)
+        if class_name == 'GaussianNB':
+            return cls.from_gaussian_nb(model)
+
+        raise ValueError(f"Unsupported model type for a linear classifier: {class_name}")
+
+    def decision_function(self, X):
+        """Unnormalized log-probabilities X @ W + b for a batch"""
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+
+        scores = X @ self.weights
+        scores += self.bias
+        return scores
+
+    def predict_proba(self, X):
+        """Class probabilities for a batch"""
+        scores = self.decision_function(X)
+        scores -= scores.max(axis=1, keepdims=True)
+        np.exp(scores, out=scores)
+        scores /= scores.sum(axis=1, keepdims=True)
+        return scores
+
+    def predict(self, X):
+        """Most probable class label for every row of a batch"""
+        # The largest log-probability is the most probable class; no need to normalize
+        return self.classes_[self.decision_function(X).argmax(axis=1)]
+
+    def top_k(self, X, k=5):
+        """Class labels and probabilities of the k most probable classes per row, best first"""
+        indices, proba = top_k_proba(self.predict_proba(X), k)
+        return self.classes_[indices], proba
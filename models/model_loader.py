@@ -1,79 +1,121 @@
 import os
-import pickle
-import joblib
+import hashlib
 import streamlit as st
 import numpy as np
+from models.model_registry import get_registry, PROJECT_ROOT
+from models.numpy_network import NetworkClassifier
+from models.tree_evaluator import FlatTreeEnsemble
+from models.linear_classifier import LinearClassifier
+from models.bit_knn import BitKNNClassifier
 
-# TensorFlow is not available in this deployment, using fallback recommendations
+# TensorFlow is not available in this deployment; Keras models run on NumPy instead
 TENSORFLOW_AVAILABLE = False
 
 class ModelLoader:
-    def __init__(self):
-        self.models_path = "attached_assets"
-        
-    @st.cache_resource
-    def load_course_model(_self):
-        """Load the Random Forest course recommendation model"""
-        try:
-            model_path = os.path.join(_self.models_path, "random_forest_courses_model_1749886366074.pkl")
-            if os.path.exists(model_path):
-                with open(model_path, 'rb') as f:
-                    model = pickle.load(f)
-                return model
-            else:
-                st.warning("Course model file not found. Using fallback recommendations.")
-                return None
-        except Exception as e:
-            st.error(f"Error loading course model: {str(e)}")
-            return None
+    # Registry artifact names used by the recommendation engine
+    COURSE_ENCODER = "courses_label_encoder"
+    CAREER_MODEL = "career_model"
+    CAREER_ENCODER = "career_options_mlb"
+
+    # Course engine -> registry artifact; every engine predicts courses_label_encoder indices
+    COURSE_ENGINES = {
+        'random_forest': "random_forest_courses_model",
+        'neural_network': "courses_model",
+        'decision_tree': "decision_tree_model",
+        'knn': "knn_model",
+        'naive_bayes': "naive_bayes_model",
+        'logistic_regression': "logistic_regression_model",
+    }
+
+    # Engines tried in order when course_engine is 'auto'
+    COURSE_ENGINE_PRIORITY = ('random_forest', 'neural_network')
+
+    # Wrappers giving raw artifacts a predict() that returns label indices
+    COURSE_ENGINE_WRAPPERS = {
+        'neural_network': NetworkClassifier,
+        'decision_tree': FlatTreeEnsemble.from_model,
+        'knn': BitKNNClassifier.from_model,
+        'naive_bayes': LinearClassifier.from_model,
+        'logistic_regression': LinearClassifier.from_model,
+    }
     
-    @st.cache_resource
-    def load_course_encoder(_self):
-        """Load the course label encoder"""
-        try:
-            encoder_path = os.path.join(_self.models_path, "courses_label_encoder_1749886366076.pkl")
-            if os.path.exists(encoder_path):
-                with open(encoder_path, 'rb') as f:
-                    encoder = pickle.load(f)
-                return encoder
+    # Engines trained with their own copy of the course label encoder
+    COURSE_ENGINE_ENCODERS = {
+        'naive_bayes': "label_encoder_nb",
+    }
+
+    def __init__(self, registry=None, course_engine='auto'):
+        if course_engine != 'auto' and course_engine not in self.COURSE_ENGINES:
+            raise ValueError(f"Unknown course engine: {course_engine}")
+
+        self.registry = registry if registry is not None else get_registry()
+        self.course_engine = course_engine
+        self.dataset_path = os.path.join(PROJECT_ROOT, "dataset", "cleaned_dataset.csv")
+
+    def _load(self, name, description):
+        """Load a shared artifact from the registry, reporting missing or broken files"""
+        model = self.registry.load(name)
+        if model is None:
+            if name in self.registry.errors:
+                st.error(f"Error loading {description}: {self.registry.errors[name]}")
             else:
-                st.warning("Course encoder file not found. Using fallback recommendations.")
-                return None
-        except Exception as e:
-            st.error(f"Error loading course encoder: {str(e)}")
-            return None
+                st.warning(f"{description.capitalize()} file not found. Using fallback recommendations.")
+        return model
+
+    def resolve_course_engine(self):
+        """Name of the course engine in use, picking the first available one for 'auto'"""
+        if self.course_engine != 'auto':
+            return self.course_engine
+
+        for engine in self.COURSE_ENGINE_PRIORITY:
+            if self.registry.get_artifact(self.COURSE_ENGINES[engine]) is not None:
+                return engine
+        return self.COURSE_ENGINE_PRIORITY[0]
+
+    def load_course_model(self):
+        """Load the course recommendation model for the selected engine"""
+        engine = self.resolve_course_engine()
+        name = self.COURSE_ENGINES[engine]
+
+        wrapper = self.COURSE_ENGINE_WRAPPERS.get(engine)
+        if wrapper is None:
+            return self._load(name, "course model")
+
+        model = self.registry.load_derived(name, wrapper)
+        if model is None:
+            self._load(name, "course model")
+        return model
+
+    def course_encoder_name(self):
+        """Registry name of the label encoder matching the selected course engine"""
+        return self.COURSE_ENGINE_ENCODERS.get(self.resolve_course_engine(), self.COURSE_ENCODER)
     
-    @st.cache_resource
-    def load_career_model(_self):
+    def load_course_encoder(self):
+        """Load the course label encoder"""
+        return self._load(self.course_encoder_name(), "course encoder")
+
+    def load_career_model(self):
         """Load the career recommendation neural network model"""
-        # TensorFlow model not available in deployment environment
-        # Application uses intelligent rule-based recommendations instead
-        return None
-    
-    @st.cache_resource
-    def load_career_encoder(_self):
+        # Evaluated with NumPy (see models/numpy_network.py) since TensorFlow is not installed
+        return self._load(self.CAREER_MODEL, "career model")
+
+    def load_career_encoder(self):
         """Load the career options multilabel binarizer"""
-        try:
-            encoder_path = os.path.join(_self.models_path, "career_options_mlb_1749886366075.pkl")
-            if os.path.exists(encoder_path):
-                with open(encoder_path, 'rb') as f:
-                    encoder = pickle.load(f)
-                return encoder
-            else:
-                st.warning("Career encoder file not found. Using fallback recommendations.")
-                return None
-        except Exception as e:
-            st.error(f"Error loading career encoder: {str(e)}")
-            return None
-    
-    @st.cache_data
-    def load_dataset(_self):
+        return self._load(self.CAREER_ENCODER, "career encoder")
+
+    def model_version(self):
+        """Combined content hash of the artifacts behind course and career predictions"""
+        names = (self.COURSE_ENGINES[self.resolve_course_engine()], self.course_encoder_name(),
+                 self.CAREER_MODEL, self.CAREER_ENCODER)
+        versions = [f"{name}={self.registry.version(name)}" for name in names]
+        return hashlib.sha256(";".join(versions).encode()).hexdigest()[:12]
+
+    def load_dataset(self):
         """Load the cleaned dataset"""
         try:
-            dataset_path = os.path.join(_self.models_path, "cleaned_dataset_1749886376399.csv")
-            if os.path.exists(dataset_path):
+            if os.path.exists(self.dataset_path):
                 import pandas as pd
-                df = pd.read_csv(dataset_path)
+                df = pd.read_csv(self.dataset_path)
                 return df
             else:
                 st.warning("Dataset file not found.")
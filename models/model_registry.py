@@ -0,0 +1,221 @@
+import os
+import hashlib
+import pickle
+import threading
+import joblib
+from models.numpy_network import DenseNetwork, H5PY_AVAILABLE
+from models.compact_format import COMPACT_DIR, load_compact
+from models.tree_evaluator import FlatTreeEnsemble
+from models.linear_classifier import LinearClassifier
+from models.bit_knn import BitKNNClassifier
+from models.label_set import LabelSet
+
+# Repository root, so artifacts resolve regardless of the working directory
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Artifact directories in priority order; the first file found for a name wins
+MODEL_DIRS = [
+    os.path.join(PROJECT_ROOT, "models", "best & final model"),
+    os.path.join(PROJECT_ROOT, "models"),
+    os.path.join(PROJECT_ROOT, "trained models"),
+]
+
+
+def _load_pickle(path):
+    """Load a joblib or plain pickle artifact"""
+    try:
+        return joblib.load(path)
+    except Exception:
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+
+
+# File extension -> loader function
+ARTIFACT_LOADERS = {
+    '.pkl': _load_pickle,
+}
+
+# Keras networks are evaluated with NumPy, so only h5py is needed to read them
+if H5PY_AVAILABLE:
+    ARTIFACT_LOADERS['.h5'] = DenseNetwork.from_h5
+
+# Compact export kind -> constructor that runs directly on the memory-mapped arrays
+COMPACT_CONSTRUCTORS = {
+    'dense_network': DenseNetwork.from_compact,
+    'tree_ensemble': FlatTreeEnsemble.from_compact,
+    'linear_classifier': LinearClassifier.from_compact,
+    'knn_bits': BitKNNClassifier.from_compact,
+    'labels': LabelSet.from_compact,
+}
+
+
+class ModelArtifact:
+    """A model file discovered on disk"""
+
+    def __init__(self, name, path):
+        self.name = name
+        self.path = path
+        self.extension = os.path.splitext(path)[1].lower()
+        self._version = None
+
+    @property
+    def version(self):
+        """Short content hash of the file, computed once"""
+        if self._version is None:
+            digest = hashlib.sha256()
+            with open(self.path, 'rb') as f:
+                for block in iter(lambda: f.read(1 << 20), b''):
+                    digest.update(block)
+            self._version = digest.hexdigest()[:12]
+        return self._version
+
+    @property
+    def size(self):
+        return os.path.getsize(self.path)
+
+
+class ModelRegistry:
+    """Framework-independent registry that discovers model artifacts and loads each once per process"""
+
+    def __init__(self, search_dirs=None, compact_dir=COMPACT_DIR):
+        self.search_dirs = list(search_dirs) if search_dirs is not None else list(MODEL_DIRS)
+        self.compact_dir = compact_dir
+        self.errors = {}
+        self._artifacts = None
+        self._models = {}
+        self._derived = {}
+        self._lock = threading.Lock()
+        self._load_locks = {}
+
+    def discover(self):
+        """Scan the search directories for loadable artifacts, keyed by file name without extension"""
+        with self._lock:
+            if self._artifacts is None:
+                artifacts = {}
+                for directory in self.search_dirs:
+                    if not os.path.isdir(directory):
+                        continue
+                    for filename in sorted(os.listdir(directory)):
+                        name, extension = os.path.splitext(filename)
+                        path = os.path.join(directory, filename)
+                        if extension.lower() in ARTIFACT_LOADERS and name not in artifacts and os.path.isfile(path):
+                            artifacts[name] = ModelArtifact(name, path)
+                self._artifacts = artifacts
+            return self._artifacts
+
+    def available(self):
+        """Names of all discovered artifacts"""
+        return sorted(self.discover())
+
+    def get_artifact(self, name):
+        """Return the artifact for a name, or None if it was not found"""
+        return self.discover().get(name)
+
+    def version(self, name):
+        """Content hash of an artifact, or None if it was not found"""
+        artifact = self.get_artifact(name)
+        return artifact.version if artifact is not None else None
+
+    def versions(self):
+        """Content hashes of every discovered artifact"""
+        return {name: artifact.version for name, artifact in self.discover().items()}
+
+    def load_compact(self, name):
+        """Open the compact export of an artifact if it exists and matches the source file, else None"""
+        if not self.compact_dir:
+            return None
+
+        path = os.path.join(self.compact_dir, name)
+        if not os.path.isfile(os.path.join(path, "meta.json")):
+            return None
+
+        try:
+            compact = load_compact(path)
+        except Exception as e:
+            self.errors[name] = f"Unreadable compact export: {e}"
+            return None
+
+        # Ignore stale exports left behind after the source artifact was retrained
+        artifact = self.get_artifact(name)
+        if artifact is not None and compact.source_version != artifact.version:
+            return None
+
+        return compact
+
+    def is_loaded(self, name):
+        return name in self._models
+
+    def load(self, name):
+        """Load an artifact once and return the shared instance, or None if missing or unloadable"""
+        if name in self._models:
+            return self._models[name]
+
+        with self._lock:
+            load_lock = self._load_locks.setdefault(name, threading.Lock())
+
+        # Only one thread loads a given artifact; others wait and reuse the result
+        with load_lock:
+            if name in self._models:
+                return self._models[name]
+
+            artifact = self.get_artifact(name)
+            if artifact is None:
+                return None
+
+            try:
+                # Prefer the memory-mapped compact export when it can be used directly
+                compact = self.load_compact(name)
+                if compact is not None and compact.kind in COMPACT_CONSTRUCTORS:
+                    model = COMPACT_CONSTRUCTORS[compact.kind](compact)
+                else:
+                    model = ARTIFACT_LOADERS[artifact.extension](artifact.path)
+            except Exception as e:
+                self.errors[name] = str(e)
+                model = None
+
+            self._models[name] = model
+            return model
+
+    def load_derived(self, name, factory):
+        """Load an artifact and convert it once with factory(model), sharing the result like load()"""
+        key = (name, factory)
+        if key in self._derived:
+            return self._derived[key]
+
+        model = self.load(name)
+        if model is None:
+            return None
+
+        with self._lock:
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+
+        with load_lock:
+            if key not in self._derived:
+                try:
+                    self._derived[key] = factory(model)
+                except Exception as e:
+                    self.errors[name] = str(e)
+                    self._derived[key] = None
+            return self._derived[key]
+
+    def clear(self):
+        """Forget loaded models and rediscover artifacts on next use"""
+        with self._lock:
+            self._artifacts = None
+            self._models = {}
+            self._derived = {}
+            self.errors = {}
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_registry():
+    """Return the process-wide model registry"""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = ModelRegistry()
+    return _registry
@@ -0,0 +1,151 @@
+import json
+import numpy as np
+
+try:
+    import h5py
+    H5PY_AVAILABLE = True
+except ImportError:
+    H5PY_AVAILABLE = False
+
+
+def _relu(x):
+    return np.maximum(x, 0, out=x)
+
+
+def _sigmoid(x):
+    # Clip to keep exp from overflowing for large negative logits
+    np.clip(x, -88.0, 88.0, out=x)
+    np.negative(x, out=x)
+    np.exp(x, out=x)
+    x += 1.0
+    return np.reciprocal(x, out=x)
+
+
+def _softmax(x):
+    x -= x.max(axis=1, keepdims=True)
+    np.exp(x, out=x)
+    x /= x.sum(axis=1, keepdims=True)
+    return x
+
+
+def _tanh(x):
+    return np.tanh(x, out=x)
+
+
+def _linear(x):
+    return x
+
+
+ACTIVATIONS = {
+    'relu': _relu,
+    'sigmoid': _sigmoid,
+    'softmax': _softmax,
+    'tanh': _tanh,
+    'linear': _linear,
+}
+
+# Layers that do nothing at inference time
+_PASSTHROUGH_LAYERS = ('InputLayer', 'Dropout')
+
+
+class DenseNetwork:
+    """Keras Sequential stack of Dense layers evaluated with NumPy, without TensorFlow"""
+
+    def __init__(self, layers):
+        # Each layer is (kernel, bias, activation name); weights are contiguous float32
+        self.layers = [
+            (np.ascontiguousarray(kernel, dtype=np.float32),
+             np.ascontiguousarray(bias, dtype=np.float32),
+             activation)
+            for kernel, bias, activation in layers
+        ]
+        for kernel, bias, activation in self.layers:
+            if activation not in ACTIVATIONS:
+                raise ValueError(f"Unsupported activation: {activation}")
+
+    @classmethod
+    def from_h5(cls, path):
+        """Read the Dense layer weights of a Keras .h5 model once"""
+        if not H5PY_AVAILABLE:
+            raise ImportError("h5py is required to read .h5 models")
+
+        with h5py.File(path, 'r') as f:
+            config = json.loads(f.attrs['model_config'])
+            if config.get('class_name') != 'Sequential':
+                raise ValueError(f"Only Sequential models are supported, got {config.get('class_name')}")
+
+            weights_group = f['model_weights']
+            layers = []
+            for layer in config['config']['layers']:
+                class_name = layer['class_name']
+                if class_name in _PASSTHROUGH_LAYERS:
+                    continue
+                if class_name != 'Dense':
+                    raise ValueError(f"Unsupported layer type: {class_name}")
+
+                layer_config = layer['config']
+                layer_group = weights_group[layer_config['name']]
+                weight_names = [
+                    name.decode() if isinstance(name, bytes) else name
+                    for name in layer_group.attrs['weight_names']
+                ]
+                kernel = layer_group[weight_names[0]][()]
+                if layer_config.get('use_bias', True):
+                    bias = layer_group[weight_names[1]][()]
+                else:
+                    bias = np.zeros(kernel.shape[1], dtype=np.float32)
+
+                layers.append((kernel, bias, layer_config.get('activation', 'linear')))
+
+        return cls(layers)
+
+    @classmethod
+    def from_compact(cls, compact):
+        """Build a network from a compact export, reusing its memory-mapped weights"""
+        activations = compact.attributes['activations']
+        layers = [
+            (compact.arrays[f'kernel_{i}'], compact.arrays[f'bias_{i}'], activation)
+            for i, activation in enumerate(activations)
+        ]
+        return cls(layers)
+
+    @property
+    def n_inputs(self):
+        return self.layers[0][0].shape[0]
+
+    @property
+    def n_outputs(self):
+        return self.layers[-1][0].shape[1]
+
+    def predict(self, X, batch_size=4096):
+        """Forward pass over a batch, returning the output layer activations like Keras' predict"""
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+
+        outputs = np.empty((X.shape[0], self.n_outputs), dtype=np.float32)
+        for start in range(0, X.shape[0], batch_size):
+            activations = X[start:start + batch_size]
+            for kernel, bias, activation in self.layers:
+                activations = activations @ kernel
+                activations += bias
+                activations = ACTIVATIONS[activation](activations)
+            outputs[start:start + batch_size] = activations
+
+        return outputs
+
+
+class NetworkClassifier:
+    """Scikit-learn style classifier around a softmax DenseNetwork, predicting label-encoder indices"""
+
+    def __init__(self, network):
+        self.network = network
+        self.classes_ = np.arange(network.n_outputs)
+
+    def predict_proba(self, X):
+        """Class probabilities for a batch"""
+        return self.network.predict(X)
+
+    def predict(self, X):
+        """Most probable class index for every row of a batch"""
+        return self.predict_proba(X).argmax(axis=1)
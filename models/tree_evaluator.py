@@ -0,0 +1,219 @@
+"""
+Evaluate fitted sklearn decision trees and forests from flat NumPy node arrays.
+
+Run as a script, it checks that the flattened evaluator (and the compact export,
+when one exists) predicts exactly what sklearn predicts for every tree model in
+the registry, on the training dataset and on random profiles.
+
+Usage:
+    python -m models.tree_evaluator [name ...] [--random-rows 20000] [--seed 0]
+"""
+import sys
+import argparse
+import numpy as np
+
+# Arrays apply() walks the trees with, derived from the node arrays
+STEP_ARRAYS = ('step_feature', 'step_threshold', 'step_children', 'depths')
+
+
+def tree_depth(children_left, children_right, root):
+    """Number of levels below root"""
+    depth = 0
+    level = np.array([root])
+    while True:
+        level = level[children_left[level] >= 0]
+        if not level.size:
+            return depth
+        level = np.concatenate([children_left[level], children_right[level]])
+        depth += 1
+
+
+def step_arrays(feature, threshold, children_left, children_right, roots):
+    """Per-node feature, threshold and interleaved children for apply(), plus the depth of every tree"""
+    # Leaves point back at themselves and always go "left", so every row can take
+    # exactly depth steps without tracking which rows have already finished
+    is_leaf = children_left < 0
+    node_ids = np.arange(len(feature), dtype=np.int32)
+    step_left = np.where(is_leaf, node_ids, children_left)
+    step_right = np.where(is_leaf, node_ids, children_right)
+
+    return {
+        'step_feature': np.where(is_leaf, 0, feature).astype(np.intp),
+        'step_threshold': np.where(is_leaf, np.inf, threshold).astype(np.float32),
+        # Interleaved (right, left) children so one gather picks the next node
+        'step_children': np.stack([step_right, step_left], axis=1).reshape(-1).astype(np.intp),
+        'depths': np.array([tree_depth(children_left, children_right, root) for root in roots], dtype=np.int32),
+    }
+
+
+def flatten_trees(estimators):
+    """Concatenate the node arrays of one or more fitted sklearn trees"""
+    features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+    offset = 0
+
+    for estimator in estimators:
+        tree = estimator.tree_
+        left = tree.children_left.astype(np.int32)
+        right = tree.children_right.astype(np.int32)
+
+        # Leaves keep -1 children; internal nodes point into the concatenated arrays
+        features.append(tree.feature.astype(np.int32))
+        thresholds.append(tree.threshold.astype(np.float32))
+        lefts.append(np.where(left >= 0, left + offset, -1).astype(np.int32))
+        rights.append(np.where(right >= 0, right + offset, -1).astype(np.int32))
+
+        value = tree.value[:, 0, :].astype(np.float32)
+        values.append(value / np.maximum(value.sum(axis=1, keepdims=True), 1e-12))
+
+        roots.append(offset)
+        offset += tree.node_count
+
+    arrays = {
+        'feature': np.concatenate(features),
+        'threshold': np.concatenate(thresholds),
+        'children_left': np.concatenate(lefts),
+        'children_right': np.concatenate(rights),
+        'value': np.concatenate(values),
+        'roots': np.array(roots, dtype=np.int32),
+    }
+    arrays.update(step_arrays(
+        arrays['feature'], arrays['threshold'], arrays['children_left'], arrays['children_right'], arrays['roots']
+    ))
+    return arrays
+
+
+class FlatTreeEnsemble:
+    """Decision tree or forest flattened into contiguous node arrays and evaluated a level at a time"""
+
+    def __init__(self, feature, threshold, children_left, children_right, value, roots, classes,
+                 step_feature=None, step_threshold=None, step_children=None, depths=None):
+        self.feature = np.ascontiguousarray(feature, dtype=np.int32)
+        self.threshold = np.ascontiguousarray(threshold, dtype=np.float32)
+        self.children_left = np.ascontiguousarray(children_left, dtype=np.int32)
+        self.children_right = np.ascontiguousarray(children_right, dtype=np.int32)
+        self.value = np.ascontiguousarray(value, dtype=np.float32)
+        self.roots = np.asarray(roots, dtype=np.int32)
+        self.classes_ = np.asarray(classes)
+        
+        if step_children is None:
+            # Compact exports written before the step arrays were stored
+            steps = step_arrays(self.feature, self.threshold, self.children_left, self.children_right, self.roots)
+            step_feature, step_threshold, step_children, depths = (steps[name] for name in STEP_ARRAYS)
+        
+        # Memory-mapped step arrays are used in place, so processes share one physical copy
+        self._step_feature = np.ascontiguousarray(step_feature, dtype=np.intp)
+        self._step_threshold = np.ascontiguousarray(step_threshold, dtype=np.float32)
+        self._step_children = np.ascontiguousarray(step_children, dtype=np.intp)
+        self._depths = [int(depth) for depth in depths]
+
+    @classmethod
+    def from_estimator(cls, estimator):
+        """Flatten a fitted DecisionTreeClassifier or RandomForestClassifier"""
+        estimators = getattr(estimator, 'estimators_', [estimator])
+        return cls(classes=estimator.classes_, **flatten_trees(estimators))
+
+    @classmethod
+    def from_compact(cls, compact):
+        """Build an evaluator from a compact export, reusing its memory-mapped arrays"""
+        arrays = compact.arrays
+        return cls(
+            arrays['feature'], arrays['threshold'], arrays['children_left'],
+            arrays['children_right'], arrays['value'], arrays['roots'], arrays['classes'],
+            *(arrays.get(name) for name in STEP_ARRAYS)
+        )
+
+    @classmethod
+    def from_model(cls, model):
+        """Return model unchanged if already flattened, otherwise flatten it"""
+        if isinstance(model, cls):
+            return model
+        return cls.from_estimator(model)
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    def apply(self, X, tree=0):
+        """Leaf index reached by every row of X in one tree of the ensemble"""
+        X = np.asarray(X, dtype=np.float32)
+        n_rows, n_features = X.shape
+        flat_X = X.reshape(-1)
+        row_offsets = np.arange(n_rows, dtype=np.intp) * n_features
+        nodes = np.full(n_rows, self.roots[tree], dtype=np.intp)
+
+        # Advance every row by one level per iteration
+        for _ in range(self._depths[tree]):
+            go_left = flat_X[row_offsets + self._step_feature[nodes]] <= self._step_threshold[nodes]
+            nodes = self._step_children[2 * nodes + go_left]
+
+        return nodes
+
+    def predict_proba(self, X):
+        """Class probabilities averaged over all trees"""
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+
+        proba = np.zeros((X.shape[0], len(self.classes_)), dtype=np.float32)
+        for tree in range(self.n_trees):
+            proba += self.value[self.apply(X, tree)]
+        proba /= self.n_trees
+
+        return proba
+
+    def predict(self, X):
+        """Most probable class label for every row of a batch"""
+        return self.classes_[self.predict_proba(X).argmax(axis=1)]
+
+
+def count_disagreements(evaluator, estimator, X):
+    """Number of rows of X on which the flattened evaluator and the sklearn estimator predict differently"""
+    return int(np.count_nonzero(evaluator.predict(X) != estimator.predict(X)))
+
+
+def main(argv=None):
+    from models.model_registry import get_registry, ARTIFACT_LOADERS
+    from utils.feature_encoder import NUM_FEATURES
+    from utils.training_data import load_training_data
+
+    parser = argparse.ArgumentParser(description="Check flattened tree models against sklearn")
+    parser.add_argument('names', nargs='*', help="registry artifact names (default: every tree model)")
+    parser.add_argument('--random-rows', type=int, default=20000, help="random profiles checked besides the dataset")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    dataset_X = load_training_data()[0]
+    random_X = (rng.random((args.random_rows, NUM_FEATURES)) < rng.uniform(0.0, 0.5, (args.random_rows, 1)))
+    X = np.vstack([dataset_X, random_X.astype(np.uint8)]).astype(np.float32)
+
+    registry = get_registry()
+    failures = 0
+    checked = 0
+    for name in args.names or registry.available():
+        artifact = registry.get_artifact(name)
+        if artifact is None or artifact.extension not in ARTIFACT_LOADERS:
+            continue
+        estimator = ARTIFACT_LOADERS[artifact.extension](artifact.path)
+        if not hasattr(estimator, 'tree_') and not hasattr(estimator, 'estimators_'):
+            continue
+
+        evaluators = {'flattened': FlatTreeEnsemble.from_estimator(estimator)}
+        compact = registry.load_compact(name)
+        if compact is not None and compact.kind == 'tree_ensemble':
+            evaluators['compact export'] = FlatTreeEnsemble.from_compact(compact)
+
+        for label, evaluator in evaluators.items():
+            disagreements = count_disagreements(evaluator, estimator, X)
+            failures += disagreements > 0
+            checked += 1
+            print(f"{name} ({label}): {disagreements} of {len(X)} predictions differ from sklearn")
+
+    if not checked:
+        print("No tree models found")
+        return 1
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
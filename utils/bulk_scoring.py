@@ -0,0 +1,197 @@
+"""
+Score a CSV of student profiles offline and stream the recommendations to a file.
+
+The input uses the CareerRecommenderDataset.csv layout: a header row naming one
+Yes/No (or 1/0) column per interest, spelled as in the dataset ("Psycology",
+"Bussiness", ...). Columns are matched by name, so their order does not matter;
+any further columns (Courses, Career_Options, ...) are ignored unless named by
+--id-column.
+
+Usage:
+    python -m utils.bulk_scoring input.csv output.jsonl [--format csv|jsonl]
+        [--chunksize 50000] [--workers N] [--engine model] [--course-engine auto]
+"""
+import os
+import sys
+import csv
+import json
+import time
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from utils.training_data import DATASET_FEATURE_COLUMNS
+
+# Cell values read as a selected interest; everything else counts as not selected
+TRUE_VALUES = ('Yes', 'yes', 'YES', 'Y', 'y', 'True', 'true', 'TRUE', '1', '1.0')
+
+OUTPUT_FORMATS = ('csv', 'jsonl')
+
+# Recommender of the current worker process, created once by _init_worker
+_worker_recommender = None
+
+
+def _init_worker(engine, course_engine):
+    """Create the recommender each worker process reuses for all of its chunks"""
+    global _worker_recommender
+    from utils.career_recommender import CareerRecommender
+    _worker_recommender = CareerRecommender(engine=engine, course_engine=course_engine)
+
+
+def _score_chunk(feature_matrix):
+    """Recommendations for every row of one chunk, as (course, careers) pairs"""
+    recommendations = _worker_recommender.get_recommendations_for_features(feature_matrix)
+    return [(recommendation['course'], recommendation['careers']) for recommendation in recommendations]
+
+
+def check_header(columns, id_column=None):
+    """Raise ValueError unless the header names the ID column (if any) and every dataset feature column"""
+    if id_column is not None and id_column not in columns:
+        raise ValueError(f"ID column {id_column!r} is not in the input header")
+
+    feature_names = set(columns) - {id_column}
+    missing = [name for name in DATASET_FEATURE_COLUMNS if name not in feature_names]
+    if missing:
+        raise ValueError(
+            f"Input header lacks {len(missing)} of the {len(DATASET_FEATURE_COLUMNS)} "
+            f"CareerRecommenderDataset.csv interest columns: {', '.join(missing)}"
+        )
+
+
+def read_profile_chunks(path, chunksize=50000, id_column=None):
+    """Iterator of (ids, uint8 feature matrix) per chunk of a dataset-layout CSV, holding one chunk in memory
+
+    The header is checked before any row is read, so a wrong layout fails immediately.
+    """
+    csv_options = dict(dtype=str, keep_default_na=False, skipinitialspace=True)
+    check_header(pd.read_csv(path, nrows=0, **csv_options).columns, id_column)
+    return _iter_profile_chunks(pd.read_csv(path, chunksize=chunksize, **csv_options), id_column)
+
+
+def _iter_profile_chunks(reader, id_column):
+    row_offset = 0
+    for chunk in reader:
+        # Features are selected by their dataset names, so the ID and other columns can sit anywhere
+        feature_matrix = chunk[list(DATASET_FEATURE_COLUMNS)].isin(TRUE_VALUES).to_numpy(dtype=np.uint8)
+
+        if id_column is not None:
+            ids = chunk[id_column].tolist()
+        else:
+            ids = list(range(row_offset, row_offset + len(chunk)))
+        row_offset += len(chunk)
+
+        yield ids, feature_matrix
+
+
+class ResultWriter:
+    """Writes (id, course, careers) rows to a CSV or JSONL file"""
+
+    def __init__(self, f, output_format, id_name='row'):
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unknown output format: {output_format}")
+
+        self.f = f
+        self.output_format = output_format
+        self.id_name = id_name
+        self.rows_written = 0
+
+        if output_format == 'csv':
+            # Careers are joined like the dataset's Career_Options column
+            self._csv = csv.writer(f)
+            self._csv.writerow([id_name, 'Courses', 'Career_Options'])
+
+    def write(self, ids, results):
+        if self.output_format == 'csv':
+            self._csv.writerows(
+                (row_id, course, ", ".join(careers)) for row_id, (course, careers) in zip(ids, results)
+            )
+        else:
+            self.f.writelines(
+                json.dumps({self.id_name: row_id, 'course': course, 'careers': careers}) + "\n"
+                for row_id, (course, careers) in zip(ids, results)
+            )
+        self.rows_written += len(ids)
+
+
+def score_file(input_path, output_path, output_format=None, chunksize=50000, workers=None,
+               engine='model', course_engine='auto', id_column=None, progress=None):
+    """Score every profile of input_path into output_path; returns the number of rows written
+
+    Chunks are scored in a process pool with at most two chunks in flight per worker,
+    and written in input order, so memory stays bounded by the chunk size.
+    workers=0 scores in the current process.
+    """
+    if output_format is None:
+        output_format = 'jsonl' if output_path.lower().endswith(('.jsonl', '.json')) else 'csv'
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    chunks = read_profile_chunks(input_path, chunksize, id_column)
+    start = time.perf_counter()
+
+    with open(output_path, 'w', newline='', encoding='utf-8') as f:
+        writer = ResultWriter(f, output_format, id_column or 'row')
+
+        def report():
+            if progress is not None:
+                elapsed = time.perf_counter() - start
+                progress(f"{writer.rows_written} rows scored ({writer.rows_written / max(elapsed, 1e-9):.0f} rows/s)")
+
+        if workers == 0:
+            _init_worker(engine, course_engine)
+            for ids, feature_matrix in chunks:
+                writer.write(ids, _score_chunk(feature_matrix))
+                report()
+            return writer.rows_written
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(engine, course_engine)) as pool:
+            pending = deque()
+            for ids, feature_matrix in chunks:
+                pending.append((ids, pool.submit(_score_chunk, feature_matrix)))
+
+                # Wait for the oldest chunk before reading further ahead than the pool can use
+                while len(pending) >= 2 * workers:
+                    done_ids, future = pending.popleft()
+                    writer.write(done_ids, future.result())
+                    report()
+
+            while pending:
+                done_ids, future = pending.popleft()
+                writer.write(done_ids, future.result())
+                report()
+
+    return writer.rows_written
+
+
+def main(argv=None):
+    from utils.career_recommender import CareerRecommender
+    from models.model_loader import ModelLoader
+
+    parser = argparse.ArgumentParser(description="Score a CSV of student profiles with the career recommender")
+    parser.add_argument('input', help="CSV with the CareerRecommenderDataset.csv interest columns")
+    parser.add_argument('output', help="results file (.csv or .jsonl)")
+    parser.add_argument('--format', choices=OUTPUT_FORMATS, help="output format (default: from the extension)")
+    parser.add_argument('--chunksize', type=int, default=50000, help="rows read and scored per chunk")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: all cores, 0: none)")
+    parser.add_argument('--engine', choices=CareerRecommender.ENGINES, default='model')
+    parser.add_argument('--course-engine', choices=('auto',) + tuple(ModelLoader.COURSE_ENGINES), default='auto')
+    parser.add_argument('--id-column', help="input column copied to the output to identify each row")
+    args = parser.parse_args(argv)
+
+    try:
+        rows = score_file(
+            args.input, args.output, args.format, args.chunksize, args.workers,
+            args.engine, args.course_engine, args.id_column,
+            progress=lambda message: print(message, file=sys.stderr)
+        )
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    print(f"Wrote {rows} recommendations to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,109 +1,258 @@
-import re
 import streamlit as st
+from functools import lru_cache
+from itertools import islice
+from contextlib import closing
+import data.career_knowledge_base as knowledge_base
 from data.career_knowledge_base import (
     get_career_info, get_course_info, get_industry_trends, 
     search_careers_by_skill, get_salary_comparison, CAREER_KNOWLEDGE_BASE
 )
-from utils.web_scraper import get_website_text_content
+from utils.cache import TTLCache
+from utils.web_scraper import fan_out, stream_text, iter_sentences, FETCH_DEADLINE
+from utils.content_index import get_content_index
+from utils.question_analyzer import IntentClassifier, EntityMatcher
+
+# Answers by (normalized question, knowledge base version); editing the knowledge base
+# changes the version, so stale answers are never served and age out of the LRU
+ANSWER_CACHE = TTLCache(maxsize=1024)
+
+# Lines rendered under a career's heading, per question type
+CAREER_SECTIONS = {
+    'salary': lambda info: (
+        f"• Salary Range: {info['salary_range']}\n"
+        f"• Job Outlook: {info['job_outlook']}\n"
+    ),
+    'education': lambda info: (
+        f"• Education: {info['education']}\n"
+        f"• Key Skills: {', '.join(info['skills_required'][:5])}\n"
+    ),
+    'skills': lambda info: (
+        f"• Required Skills: {', '.join(info['skills_required'])}\n"
+        f"• Work Environment: {info['work_environment']}\n"
+    ),
+    'job_outlook': lambda info: (
+        f"• Job Outlook: {info['job_outlook']}\n"
+        f"• Related Careers: {', '.join(info.get('related_careers', [])[:3])}\n"
+    ),
+    'work_environment': lambda info: (
+        f"• Work Environment: {info['work_environment']}\n"
+        f"• Description: {info['description'][:150]}...\n"
+    ),
+}
+
+TREND_INDUSTRIES = ['technology', 'healthcare', 'business', 'education']
+
+
+def normalize_question(question):
+    """Lower-case a question and collapse its whitespace, so trivially different spellings share an answer"""
+    return " ".join(question.lower().split())
+
+
+class AnswerFragments:
+    """Markdown blocks of the Q&A answers, rendered once per knowledge base version
+    
+    Blocks for the careers and courses the entity matcher can report are rendered up front;
+    any other name is rendered on first use and kept.
+    """
+    
+    def __init__(self, careers=(), courses=(), skills=()):
+        self.version = knowledge_base.KNOWLEDGE_BASE_VERSION
+        self._career_blocks = {}
+        self._comparison_blocks = {}
+        self._course_blocks = {}
+        self._skill_matches = {}
+        
+        for career in careers:
+            for section in CAREER_SECTIONS:
+                self.career_block(section, career)
+            self.comparison_block(career)
+        for course in courses:
+            self.course_block(course)
+        for skill in skills:
+            self.skill_matches(skill)
+        
+        self.trends = self._render_trends()
+    
+    def career_block(self, section, career):
+        """Heading and section lines for one career, or '' when the career is unknown"""
+        key = (section, career)
+        block = self._career_blocks.get(key)
+        if block is None:
+            career_info = get_career_info(career)
+            block = f"**{career.title()}:**\n{CAREER_SECTIONS[section](career_info)}\n" if career_info else ""
+            self._career_blocks[key] = block
+        return block
+    
+    def comparison_block(self, career):
+        """Salary and outlook block used by career comparisons, or '' when the career is unknown"""
+        block = self._comparison_blocks.get(career)
+        if block is None:
+            block = "".join(
+                f"**{item['career']}:**\n"
+                f"• Salary: {item['salary_range']}\n"
+                f"• Outlook: {item['job_outlook']}\n\n"
+                for item in get_salary_comparison([career])
+            )
+            self._comparison_blocks[career] = block
+        return block
+    
+    def course_block(self, course):
+        """Duration, subjects and career paths of one course, or '' when the course is unknown"""
+        block = self._course_blocks.get(course)
+        if block is None:
+            course_info = get_course_info(course)
+            block = (
+                f"**{course.title()}:**\n"
+                f"• Duration: {course_info['duration']}\n"
+                f"• Core Subjects: {', '.join(course_info['core_subjects'][:5])}\n"
+                f"• Career Paths: {', '.join(course_info['career_paths'][:4])}\n\n"
+            ) if course_info else ""
+            self._course_blocks[course] = block
+        return block
+    
+    def skill_matches(self, skill):
+        """(career name, block) of every career requiring a skill"""
+        matches = self._skill_matches.get(skill)
+        if matches is None:
+            matches = tuple(
+                (career['name'],
+                 f"**{career['name']}:**\n"
+                 f"• Category: {career['category'].title()}\n"
+                 f"• Description: {career['description'][:120]}...\n\n")
+                for career in search_careers_by_skill(skill)
+            )
+            self._skill_matches[skill] = matches
+        return matches
+    
+    def _render_trends(self):
+        parts = ["Here are current industry trends:\n\n"]
+        for industry in TREND_INDUSTRIES:
+            trends = get_industry_trends(industry)
+            if trends:
+                parts.append(f"**{industry.title()} Industry:**\n")
+                parts.extend(f"• {trend}\n" for trend in trends[:3])
+                parts.append("\n")
+        return "".join(parts)
+
+
+@lru_cache(maxsize=2)
+def _answer_fragments(version):
+    terms = CareerQASystem.ENTITY_TERMS
+    return AnswerFragments(terms['careers'], terms['courses'], terms['skills'])
+
+
+def get_answer_fragments():
+    """Return the answer fragments of the current knowledge base, rendering them on first use"""
+    return _answer_fragments(knowledge_base.KNOWLEDGE_BASE_VERSION)
+
 
 class CareerQASystem:
+    # Question type -> patterns, in priority order: the first type with a matching pattern wins
+    QUESTION_PATTERNS = {
+        'salary': [
+            r'salary|pay|earn|income|money|wage',
+            r'how much.*make|how much.*earn|what.*pay'
+        ],
+        'education': [
+            r'education|degree|study|learn|school|college|university',
+            r'what.*study|how.*become|requirements'
+        ],
+        'skills': [
+            r'skills|abilities|qualifications|competencies',
+            r'what.*skills|need.*skills'
+        ],
+        'job_outlook': [
+            r'outlook|future|growth|demand|opportunities',
+            r'job.*market|career.*prospects'
+        ],
+        'work_environment': [
+            r'work.*environment|workplace|office|remote',
+            r'where.*work|work.*conditions'
+        ],
+        'career_comparison': [
+            r'compare|versus|vs|difference|better',
+            r'which.*career|compare.*careers'
+        ],
+        'course_info': [
+            r'course|program|curriculum|subjects',
+            r'what.*course|which.*program'
+        ],
+        'industry_trends': [
+            r'trends|future|emerging|technology|innovation',
+            r'industry.*trends|what.*happening'
+        ]
+    }
+    
+    # Terms recognized as careers, courses and skills in a question
+    ENTITY_TERMS = {
+        'careers': [
+            'software developer', 'data scientist', 'nurse', 'teacher', 'doctor',
+            'engineer', 'manager', 'analyst', 'designer', 'writer', 'programmer',
+            'developer', 'marketing', 'finance', 'accounting', 'psychology',
+            'cybersecurity', 'physical therapist', 'graphic designer'
+        ],
+        'courses': [
+            'computer science', 'business administration', 'nursing', 'marketing',
+            'engineering', 'psychology', 'medicine', 'education', 'finance',
+            'graphic design', 'journalism', 'biology', 'chemistry', 'physics'
+        ],
+        'skills': [
+            'programming', 'coding', 'leadership', 'communication', 'analytical',
+            'creative', 'problem solving', 'teamwork', 'organization'
+        ]
+    }
+    
+    # Reliable career information sources: Bureau of Labor Statistics
+    REFERENCE_URLS = [
+        "https://www.bls.gov/ooh/",
+    ]
+    
+    # Compiled once when the class is defined and shared by every instance
+    INTENT_CLASSIFIER = IntentClassifier(QUESTION_PATTERNS)
+    ENTITY_MATCHER = EntityMatcher(ENTITY_TERMS)
+    
     def __init__(self):
-        self.question_patterns = {
-            'salary': [
-                r'salary|pay|earn|income|money|wage',
-                r'how much.*make|how much.*earn|what.*pay'
-            ],
-            'education': [
-                r'education|degree|study|learn|school|college|university',
-                r'what.*study|how.*become|requirements'
-            ],
-            'skills': [
-                r'skills|abilities|qualifications|competencies',
-                r'what.*skills|need.*skills'
-            ],
-            'job_outlook': [
-                r'outlook|future|growth|demand|opportunities',
-                r'job.*market|career.*prospects'
-            ],
-            'work_environment': [
-                r'work.*environment|workplace|office|remote',
-                r'where.*work|work.*conditions'
-            ],
-            'career_comparison': [
-                r'compare|versus|vs|difference|better',
-                r'which.*career|compare.*careers'
-            ],
-            'course_info': [
-                r'course|program|curriculum|subjects',
-                r'what.*course|which.*program'
-            ],
-            'industry_trends': [
-                r'trends|future|emerging|technology|innovation',
-                r'industry.*trends|what.*happening'
-            ]
-        }
+        self.question_patterns = self.QUESTION_PATTERNS
+        # Render the answer fragments now rather than on the first question
+        get_answer_fragments()
+    
+    def answer_question(self, question):
+        """Return (question type, answer) for a question, reusing the answer of an identical earlier question"""
+        normalized = normalize_question(question)
+        key = (normalized, knowledge_base.KNOWLEDGE_BASE_VERSION)
+        
+        cached = ANSWER_CACHE.get(key)
+        if cached is None:
+            analysis = self.analyze_question(normalized)
+            cached = (analysis['type'], self.generate_answer(analysis))
+            ANSWER_CACHE.set(key, cached)
+        return cached
+    
+    def answer_cache_stats(self):
+        """Hit/miss counters of the shared answer cache"""
+        return ANSWER_CACHE.stats()
     
     def analyze_question(self, question):
         """Analyze the user's question to determine intent and extract entities"""
         question_lower = question.lower()
         
-        # Determine question type
-        question_type = 'general'
-        for qtype, patterns in self.question_patterns.items():
-            for pattern in patterns:
-                if re.search(pattern, question_lower):
-                    question_type = qtype
-                    break
-            if question_type != 'general':
-                break
+        # Determine question type, with the share of its patterns that matched as confidence
+        question_type, confidence, intent_scores = self.INTENT_CLASSIFIER.classify(question_lower)
         
         # Extract career/course names
         entities = self._extract_entities(question_lower)
         
         return {
             'type': question_type,
+            'confidence': confidence,
+            'intent_scores': intent_scores,
             'entities': entities,
             'original_question': question
         }
     
     def _extract_entities(self, text):
         """Extract career and course names from the question"""
-        entities = {'careers': [], 'courses': [], 'skills': []}
-        
-        # Common career terms
-        career_terms = [
-            'software developer', 'data scientist', 'nurse', 'teacher', 'doctor',
-            'engineer', 'manager', 'analyst', 'designer', 'writer', 'programmer',
-            'developer', 'marketing', 'finance', 'accounting', 'psychology',
-            'cybersecurity', 'physical therapist', 'graphic designer'
-        ]
-        
-        # Common course terms
-        course_terms = [
-            'computer science', 'business administration', 'nursing', 'marketing',
-            'engineering', 'psychology', 'medicine', 'education', 'finance',
-            'graphic design', 'journalism', 'biology', 'chemistry', 'physics'
-        ]
-        
-        # Common skills
-        skill_terms = [
-            'programming', 'coding', 'leadership', 'communication', 'analytical',
-            'creative', 'problem solving', 'teamwork', 'organization'
-        ]
-        
-        for career in career_terms:
-            if career in text:
-                entities['careers'].append(career)
-        
-        for course in course_terms:
-            if course in text:
-                entities['courses'].append(course)
-        
-        for skill in skill_terms:
-            if skill in text:
-                entities['skills'].append(skill)
-        
-        return entities
+        return self.ENTITY_MATCHER.match(text)
     
     def generate_answer(self, analysis):
         """Generate a comprehensive answer based on question analysis"""
@@ -140,139 +289,68 @@ class CareerQASystem:
         else:
             return self._generate_general_career_guidance()
     
+    def _answer_career_sections(self, header, section, careers):
+        """Header followed by the precomputed section block of up to 3 careers"""
+        fragments = get_answer_fragments()
+        return header + "".join(fragments.career_block(section, career) for career in careers[:3])
+    
     def _answer_salary_question(self, careers):
         """Answer salary-related questions"""
-        response = "Here's salary information for the careers you asked about:\n\n"
-        
-        for career in careers[:3]:  # Limit to 3 careers
-            career_info = get_career_info(career)
-            if career_info:
-                response += f"**{career.title()}:**\n"
-                response += f"• Salary Range: {career_info['salary_range']}\n"
-                response += f"• Job Outlook: {career_info['job_outlook']}\n\n"
-        
-        response += "Salaries can vary based on location, experience, education, and company size."
-        return response
+        response = self._answer_career_sections(
+            "Here's salary information for the careers you asked about:\n\n", 'salary', careers
+        )
+        return response + "Salaries can vary based on location, experience, education, and company size."
     
     def _answer_education_question(self, careers):
         """Answer education-related questions"""
-        response = "Here are the education requirements:\n\n"
-        
-        for career in careers[:3]:
-            career_info = get_career_info(career)
-            if career_info:
-                response += f"**{career.title()}:**\n"
-                response += f"• Education: {career_info['education']}\n"
-                response += f"• Key Skills: {', '.join(career_info['skills_required'][:5])}\n\n"
-        
-        return response
+        return self._answer_career_sections("Here are the education requirements:\n\n", 'education', careers)
     
     def _answer_skills_question(self, careers):
         """Answer skills-related questions"""
-        response = "Here are the key skills needed:\n\n"
-        
-        for career in careers[:3]:
-            career_info = get_career_info(career)
-            if career_info:
-                response += f"**{career.title()}:**\n"
-                response += f"• Required Skills: {', '.join(career_info['skills_required'])}\n"
-                response += f"• Work Environment: {career_info['work_environment']}\n\n"
-        
-        return response
+        return self._answer_career_sections("Here are the key skills needed:\n\n", 'skills', careers)
     
     def _answer_job_outlook_question(self, careers):
         """Answer job outlook questions"""
-        response = "Here's the job market outlook:\n\n"
-        
-        for career in careers[:3]:
-            career_info = get_career_info(career)
-            if career_info:
-                response += f"**{career.title()}:**\n"
-                response += f"• Job Outlook: {career_info['job_outlook']}\n"
-                response += f"• Related Careers: {', '.join(career_info.get('related_careers', [])[:3])}\n\n"
-        
-        return response
+        return self._answer_career_sections("Here's the job market outlook:\n\n", 'job_outlook', careers)
     
     def _answer_work_environment_question(self, careers):
         """Answer work environment questions"""
-        response = "Here's information about work environments:\n\n"
-        
-        for career in careers[:3]:
-            career_info = get_career_info(career)
-            if career_info:
-                response += f"**{career.title()}:**\n"
-                response += f"• Work Environment: {career_info['work_environment']}\n"
-                response += f"• Description: {career_info['description'][:150]}...\n\n"
-        
-        return response
+        return self._answer_career_sections(
+            "Here's information about work environments:\n\n", 'work_environment', careers
+        )
     
     def _answer_comparison_question(self, careers):
         """Compare multiple careers"""
-        response = "Here's a comparison of these careers:\n\n"
-        
-        comparison_data = get_salary_comparison(careers[:3])
-        
-        for item in comparison_data:
-            response += f"**{item['career']}:**\n"
-            response += f"• Salary: {item['salary_range']}\n"
-            response += f"• Outlook: {item['job_outlook']}\n\n"
-        
-        return response
+        fragments = get_answer_fragments()
+        return "Here's a comparison of these careers:\n\n" + "".join(
+            fragments.comparison_block(career) for career in careers[:3]
+        )
     
     def _answer_course_question(self, courses):
         """Answer course-related questions"""
-        response = "Here's information about these courses:\n\n"
-        
-        for course in courses[:3]:
-            course_info = get_course_info(course)
-            if course_info:
-                response += f"**{course.title()}:**\n"
-                response += f"• Duration: {course_info['duration']}\n"
-                response += f"• Core Subjects: {', '.join(course_info['core_subjects'][:5])}\n"
-                response += f"• Career Paths: {', '.join(course_info['career_paths'][:4])}\n\n"
-        
-        return response
+        fragments = get_answer_fragments()
+        return "Here's information about these courses:\n\n" + "".join(
+            fragments.course_block(course) for course in courses[:3]
+        )
     
     def _answer_trends_question(self, entities):
         """Answer industry trends questions"""
-        response = "Here are current industry trends:\n\n"
-        
-        # Determine industry from entities
-        industries = ['technology', 'healthcare', 'business', 'education']
-        
-        for industry in industries:
-            trends = get_industry_trends(industry)
-            if trends:
-                response += f"**{industry.title()} Industry:**\n"
-                for trend in trends[:3]:
-                    response += f"• {trend}\n"
-                response += "\n"
-        
-        return response
+        return get_answer_fragments().trends
     
     def _answer_skills_based_career_search(self, skills):
         """Find careers based on skills"""
-        response = "Based on your skills, here are suitable careers:\n\n"
-        
-        all_matching_careers = []
-        for skill in skills:
-            matching = search_careers_by_skill(skill)
-            all_matching_careers.extend(matching)
+        fragments = get_answer_fragments()
         
-        # Remove duplicates
-        unique_careers = []
+        # Careers matching any skill, first occurrence kept
+        blocks = []
         seen = set()
-        for career in all_matching_careers:
-            if career['name'] not in seen:
-                unique_careers.append(career)
-                seen.add(career['name'])
-        
-        for career in unique_careers[:5]:
-            response += f"**{career['name']}:**\n"
-            response += f"• Category: {career['category'].title()}\n"
-            response += f"• Description: {career['description'][:120]}...\n\n"
+        for skill in skills:
+            for name, block in fragments.skill_matches(skill):
+                if name not in seen:
+                    blocks.append(block)
+                    seen.add(name)
         
-        return response
+        return "Based on your skills, here are suitable careers:\n\n" + "".join(blocks[:5])
     
     def _generate_general_career_guidance(self):
         """Generate general career guidance"""
@@ -303,51 +381,71 @@ Feel free to ask specific questions like:
 
 How can I help you with your career exploration?"""
 
-    def get_web_enhanced_answer(self, question, base_answer):
+    def get_web_enhanced_answer(self, question, base_answer, deadline=FETCH_DEADLINE):
         """Enhance answer with web search results for current information"""
         try:
-            # Try to get additional information from reliable career websites
-            search_queries = self._generate_search_queries(question)
+            if get_content_index() is not None:
+                # Answer from the offline reference index instead of scraping while the user waits
+                relevant_snippet = self._extract_relevant_snippet(None, question)
+                if relevant_snippet:
+                    return base_answer + f"\n\n**Additional Current Information:**\n{relevant_snippet}"
+                return base_answer
+            
+            # Try to get additional information from reliable career websites, all at once
+            search_queries = self._generate_search_queries(question)[:2]  # Limit to 2 sources
+            snippets = fan_out(
+                lambda url: self._stream_relevant_snippet(url, question, deadline), search_queries, deadline
+            )
             
             additional_info = ""
-            for query_url in search_queries[:2]:  # Limit to 2 sources
-                try:
-                    content = get_website_text_content(query_url)
-                    if content and len(content) > 100:
-                        # Extract relevant snippets
-                        relevant_snippet = self._extract_relevant_snippet(content, question)
-                        if relevant_snippet:
-                            additional_info += f"\n\n**Additional Current Information:**\n{relevant_snippet}"
-                        break
-                except:
-                    continue
+            for query_url in search_queries:
+                relevant_snippet = snippets.get(query_url)
+                if relevant_snippet:
+                    # Use the first source with relevant information
+                    additional_info += f"\n\n**Additional Current Information:**\n{relevant_snippet}"
+                    break
             
             return base_answer + additional_info
             
         except Exception as e:
             return base_answer
     
+    def _stream_relevant_snippet(self, url, question, timeout):
+        """Snippet of one source, reading a page missing from the cache only until the snippet is complete"""
+        with closing(stream_text(url, timeout=timeout)) as chunks:
+            return self._extract_relevant_snippet(chunks, question)
+    
     def _generate_search_queries(self, question):
         """Generate search URLs for reliable career information"""
         # Use Bureau of Labor Statistics and other reliable sources
-        base_urls = [
-            "https://www.bls.gov/ooh/",  # Bureau of Labor Statistics
-        ]
-        
-        return base_urls
+        return list(self.REFERENCE_URLS)
     
     def _extract_relevant_snippet(self, content, question):
-        """Extract relevant information from web content"""
-        # Simple relevance extraction based on question keywords
-        sentences = content.split('.')[:10]  # First 10 sentences
+        """Extract relevant information for a question from the reference index, else from web content
+        
+        content is a string, a stream of text chunks, or None to consult only the index.
+        """
+        index = get_content_index()
+        if index is not None:
+            ranked = index.search(question, 3)
+            if ranked:
+                return '. '.join(ranked) + '.'
+        if content is None:
+            return None
+        
+        # Simple relevance extraction based on question keywords, over the first 10 sentences
+        chunks = [content] if isinstance(content, str) else content
         relevant = []
         
         question_words = question.lower().split()
-        for sentence in sentences:
+        for sentence in islice(iter_sentences(chunks), 10):
             if any(word in sentence.lower() for word in question_words):
                 relevant.append(sentence.strip())
+                if len(relevant) == 3:
+                    # Enough found; a streamed page is not read any further
+                    break
         
         if relevant:
-            return '. '.join(relevant[:3]) + '.'
+            return '. '.join(relevant) + '.'
         
-        return None
\ No newline at end of file
+        return None
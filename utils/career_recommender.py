@@ -2,13 +2,40 @@ import os
 import numpy as np
 import pandas as pd
 from utils.text_processor import TextProcessor
+from utils.feature_encoder import encode_profile, encode_profiles, pack_features
+from utils.cache import TTLCache
+from utils.similarity_index import get_similarity_index
+from utils.profile_lookup import get_profile_table
+from utils.rule_engine import get_rule_table
 from models.model_loader import ModelLoader
+from models.linear_classifier import top_k_proba
+from models.ensemble import get_course_ensemble
 import streamlit as st
 
+# Process-wide cache of recommendations keyed by (packed feature vector, model version)
+RECOMMENDATION_CACHE = TTLCache(maxsize=4096, ttl=3600)
+
 class CareerRecommender:
-    def __init__(self):
-        self.text_processor = TextProcessor()
-        self.model_loader = ModelLoader()
+    # 'model' uses the trained classifiers, 'similarity' votes over the most similar students in the dataset,
+    # 'ensemble' combines every available course model by weighted soft voting
+    ENGINES = ('model', 'similarity', 'ensemble')
+    
+    # Careers whose predicted probability exceeds the threshold are recommended, at most
+    # MAX_CAREERS of them; rows with none fall back to their FALLBACK_CAREERS most probable
+    CAREER_THRESHOLD = 0.5
+    MAX_CAREERS = 5
+    FALLBACK_CAREERS = 3
+    
+    def __init__(self, engine='model', course_engine='auto', ensemble_weights=None):
+        if engine not in self.ENGINES:
+            raise ValueError(f"Unknown recommendation engine: {engine}")
+        
+        self.engine = engine
+        self.text_processor = TextProcessor(mode='fast')
+        self.model_loader = ModelLoader(course_engine=course_engine)
+        self.ensemble = None
+        if engine == 'ensemble':
+            self.ensemble = get_course_ensemble(ensemble_weights)
         
     def get_recommendations(self, user_profile):
         """Get course and career recommendations based on user profile"""
@@ -16,56 +43,143 @@ class CareerRecommender:
             # Create feature vector from user profile
             feature_vector = self._create_feature_vector(user_profile)
             
-            if sum(feature_vector) == 0:
-                return {
-                    'course': 'Please provide more information about your interests to get personalized recommendations.',
-                    'careers': ['Share your skills and hobbies to discover suitable career paths!']
-                }
+            if not feature_vector.any():
+                return self._get_empty_profile_response()
             
-            # Get course recommendation
-            course_recommendation = self._get_course_recommendation(feature_vector)
+            # Repeated or popular profiles are served without running inference
+            cache_key = (int(pack_features(feature_vector)), self.model_version)
+            recommendation = RECOMMENDATION_CACHE.get(cache_key)
             
-            # Get career recommendations
-            career_recommendations = self._get_career_recommendations(feature_vector)
+            if recommendation is None:
+                recommendation = self._score_profile(feature_vector)
+                RECOMMENDATION_CACHE.set(cache_key, recommendation)
             
-            return {
-                'course': course_recommendation,
-                'careers': career_recommendations
-            }
+            return self._copy_recommendation(recommendation)
             
         except Exception as e:
             st.error(f"Error in recommendation system: {str(e)}")
             return self._get_fallback_recommendations(user_profile)
     
+    def get_recommendations_batch(self, profiles):
+        """Get course and career recommendations for many user profiles at once, in input order"""
+        profiles = list(profiles)
+        if not profiles:
+            return []
+        
+        try:
+            # Assemble one 2-D feature matrix for the whole batch
+            return self._recommend_feature_matrix(encode_profiles(profiles))
+            
+        except Exception as e:
+            st.error(f"Error in recommendation system: {str(e)}")
+            return [self._get_fallback_recommendations(profile) for profile in profiles]
+    
+    def get_recommendations_for_features(self, feature_matrix):
+        """Get recommendations for every row of a binary (rows x interests) feature matrix, in row order"""
+        feature_matrix = np.asarray(feature_matrix)
+        if not len(feature_matrix):
+            return []
+        
+        try:
+            return self._recommend_feature_matrix(feature_matrix)
+            
+        except Exception as e:
+            st.error(f"Error in recommendation system: {str(e)}")
+            return [self._get_fallback_recommendations({}) for _ in range(len(feature_matrix))]
+    
+    def _recommend_feature_matrix(self, feature_matrix):
+        """Serve each distinct row of a feature matrix from the cache or score it once"""
+        packed_profiles = pack_features(feature_matrix)
+        model_version = self.model_version
+        
+        # Repeated rows (common in dataset exports) are looked up and scored only once
+        unique_packed, first_rows, inverse = np.unique(packed_profiles, return_index=True, return_inverse=True)
+        
+        unique_results = [None] * len(unique_packed)
+        uncached = []
+        for j, packed in enumerate(unique_packed):
+            if packed == 0:
+                unique_results[j] = self._get_empty_profile_response()
+                continue
+            
+            cached = RECOMMENDATION_CACHE.get((int(packed), model_version))
+            if cached is None:
+                uncached.append(j)
+            else:
+                unique_results[j] = cached
+        
+        if uncached:
+            # Score all uncached profiles in a single vectorized call per model
+            scored = self._score_profiles(feature_matrix[first_rows[uncached]].astype(np.float32))
+            
+            for j, recommendation in zip(uncached, scored):
+                RECOMMENDATION_CACHE.set((int(unique_packed[j]), model_version), recommendation)
+                unique_results[j] = recommendation
+        
+        return [self._copy_recommendation(unique_results[j]) for j in inverse.reshape(-1)]
+    
+    @property
+    def model_version(self):
+        """Identifier of the engine and models producing recommendations, used in cache keys"""
+        if self.engine == 'model':
+            return f"{self.engine}:{self.model_loader.model_version()}"
+        if self.engine == 'ensemble':
+            return f"{self.engine}:{self.ensemble.version()}:{self.model_loader.model_version()}"
+        return self.engine
+    
+    def _score_profile(self, feature_vector):
+        """Run the configured engine over one non-empty feature vector"""
+        if self.engine == 'similarity':
+            return self._get_similarity_recommendations(feature_vector)
+        
+        if self.engine == 'ensemble':
+            return self._score_profiles(feature_vector.reshape(1, -1).astype(np.float32))[0]
+        
+        return {
+            'course': self._get_course_recommendation(feature_vector),
+            'careers': self._get_career_recommendations(feature_vector)
+        }
+    
+    def _score_profiles(self, feature_matrix):
+        """Run the configured engine over a feature matrix of non-empty profiles"""
+        if self.engine == 'similarity':
+            return [self._get_similarity_recommendations(row) for row in feature_matrix]
+        
+        if self.engine == 'ensemble':
+            course_recommendations = self._get_ensemble_course_recommendations(feature_matrix)
+        else:
+            course_recommendations = self._get_course_recommendations_batch(feature_matrix)
+        career_recommendations = self._get_career_recommendations_batch(feature_matrix)
+        return [
+            {'course': course, 'careers': careers}
+            for course, careers in zip(course_recommendations, career_recommendations)
+        ]
+    
+    def _copy_recommendation(self, recommendation):
+        """Copy a cached recommendation so callers cannot mutate the shared entry"""
+        return {
+            'course': recommendation['course'],
+            'careers': list(recommendation['careers'])
+        }
+    
+    def _get_empty_profile_response(self):
+        """Response for profiles without any recognized interests"""
+        return {
+            'course': 'Please provide more information about your interests to get personalized recommendations.',
+            'careers': ['Share your skills and hobbies to discover suitable career paths!']
+        }
+    
     def _create_feature_vector(self, user_profile):
         """Create feature vector from user profile data"""
-        from data.interests_mapping import INTERESTS_LIST
-        
-        feature_vector = [0] * len(INTERESTS_LIST)
-        
-        # Process selected interests
-        if 'selected_interests' in user_profile:
-            for interest in user_profile['selected_interests']:
-                try:
-                    idx = INTERESTS_LIST.index(interest)
-                    feature_vector[idx] = 1
-                except ValueError:
-                    continue
-        
-        # Process chat keywords
-        if 'chat_keywords' in user_profile:
-            for keyword in user_profile['chat_keywords']:
-                try:
-                    if keyword in INTERESTS_LIST:
-                        idx = INTERESTS_LIST.index(keyword)
-                        feature_vector[idx] = 1
-                except ValueError:
-                    continue
-        
-        return feature_vector
+        return encode_profile(user_profile)
     
     def _get_course_recommendation(self, feature_vector):
         """Get course recommendation using the trained model"""
+        # Profiles seen in the dataset are answered directly from the pattern table
+        course_name = self._lookup_course(feature_vector)
+        if course_name is not None:
+            return course_name
+        
         try:
             # Load models
             course_model = self.model_loader.load_course_model()
@@ -83,6 +197,123 @@ class CareerRecommender:
         except Exception as e:
             return self._get_fallback_course_recommendation(feature_vector)
     
+    def _get_course_recommendations_batch(self, feature_matrix):
+        """Get course recommendations for every row of a feature matrix"""
+        if len(feature_matrix) == 0:
+            return []
+        
+        # Profiles seen in the dataset are answered directly from the pattern table
+        course_names = self._lookup_courses(feature_matrix)
+        missing = [i for i, course_name in enumerate(course_names) if course_name is None]
+        if not missing:
+            return course_names
+        
+        missing_matrix = feature_matrix[missing]
+        try:
+            # Load models
+            course_model = self.model_loader.load_course_model()
+            course_encoder = self.model_loader.load_course_encoder()
+            
+            if course_model is None or course_encoder is None:
+                predicted = self._get_fallback_course_recommendations_batch(missing_matrix)
+            else:
+                # One predict and one inverse_transform for the remaining rows
+                predictions = course_model.predict(missing_matrix)
+                predicted = list(course_encoder.inverse_transform(predictions))
+            
+        except Exception as e:
+            predicted = self._get_fallback_course_recommendations_batch(missing_matrix)
+        
+        for i, course_name in zip(missing, predicted):
+            course_names[i] = course_name
+        
+        return course_names
+    
+    def _get_ensemble_course_recommendations(self, feature_matrix):
+        """Consensus course of all available course models for every row of a feature matrix"""
+        # Profiles seen in the dataset are answered directly from the pattern table
+        course_names = self._lookup_courses(feature_matrix)
+        missing = [i for i, course_name in enumerate(course_names) if course_name is None]
+        if not missing:
+            return course_names
+        
+        missing_matrix = feature_matrix[missing]
+        try:
+            # Falls back to the rules only when no course model at all could score the batch
+            predicted = self.ensemble.predict(missing_matrix)[0]
+        except Exception as e:
+            predicted = self._get_fallback_course_recommendations_batch(missing_matrix)
+        
+        for i, course_name in zip(missing, predicted):
+            course_names[i] = course_name
+        
+        return course_names
+    
+    def get_ensemble_stats(self):
+        """Per-engine latency and agreement with the ensemble consensus, or None outside ensemble mode"""
+        return self.ensemble.stats() if self.ensemble is not None else None
+    
+    def get_course_rankings(self, user_profile, k=5):
+        """Top-k (course, probability) pairs for one user profile, most probable first"""
+        return self.get_course_rankings_batch([user_profile], k)[0]
+    
+    def get_course_rankings_batch(self, profiles, k=5):
+        """Top-k (course, probability) pairs for every profile; empty lists if the model cannot rank"""
+        profiles = list(profiles)
+        if not profiles:
+            return []
+        
+        rankings = [[] for _ in profiles]
+        feature_matrix = encode_profiles(profiles)
+        scored = np.flatnonzero(feature_matrix.any(axis=1))
+        if not len(scored):
+            return rankings
+        
+        try:
+            if self.engine == 'ensemble':
+                # Rank by the combined soft vote over the shared course label space
+                proba = self.ensemble.score(feature_matrix[scored])[0]
+                top_columns, top_proba = top_k_proba(proba, k)
+                courses = self.ensemble.course_labels()[top_columns]
+            else:
+                course_model = self.model_loader.load_course_model()
+                course_encoder = self.model_loader.load_course_encoder()
+                
+                if course_model is None or course_encoder is None or not hasattr(course_model, 'predict_proba'):
+                    return rankings
+                
+                # One predict_proba for the batch; linear engines score it as a single X @ W + b
+                proba = course_model.predict_proba(feature_matrix[scored].astype(np.float32))
+                top_columns, top_proba = top_k_proba(proba, k)
+                labels = np.asarray(course_model.classes_)[top_columns]
+                courses = course_encoder.inverse_transform(labels.reshape(-1)).reshape(labels.shape)
+            
+            for i, row_courses, row_proba in zip(scored, courses, top_proba):
+                rankings[i] = [(course, float(p)) for course, p in zip(row_courses, row_proba)]
+        
+        except Exception as e:
+            st.error(f"Error ranking courses: {str(e)}")
+        
+        return rankings
+    
+    def _lookup_course(self, feature_vector):
+        """Return the dataset course for an exact profile match, or None"""
+        try:
+            return get_profile_table().lookup_course(feature_vector)
+        except Exception as e:
+            return None
+    
+    def _lookup_courses(self, feature_matrix):
+        """Dataset course of every row with an exact profile match, None for the others"""
+        try:
+            return get_profile_table().lookup_courses(feature_matrix)
+        except Exception as e:
+            return [None] * len(feature_matrix)
+    
+    def get_lookup_stats(self):
+        """Hit-rate counters of the exact-match profile table"""
+        return get_profile_table().stats()
+    
     def _get_career_recommendations(self, feature_vector):
         """Get career recommendations using the trained model"""
         try:
@@ -96,70 +327,99 @@ class CareerRecommender:
             # Make prediction
             prediction = career_model.predict([feature_vector])[0]
             
-            # Convert binary predictions to career names
-            threshold = 0.5
-            predicted_careers = []
+            return self._decode_career_prediction(prediction, career_encoder.classes_)
+            
+        except Exception as e:
+            return self._get_fallback_career_recommendations(feature_vector)
+    
+    def _get_career_recommendations_batch(self, feature_matrix):
+        """Get career recommendations for every row of a feature matrix"""
+        if len(feature_matrix) == 0:
+            return []
+        
+        try:
+            # Load models
+            career_model = self.model_loader.load_career_model()
+            career_encoder = self.model_loader.load_career_encoder()
+            
+            if career_model is None or career_encoder is None:
+                return self._get_fallback_career_recommendations_batch(feature_matrix)
             
-            for i, prob in enumerate(prediction):
-                if prob > threshold:
-                    career_labels = career_encoder.classes_
-                    if i < len(career_labels):
-                        predicted_careers.append(career_labels[i])
+            # One forward pass and one vectorized decode for the whole batch
+            predictions = career_model.predict(feature_matrix)
+            return self._decode_career_predictions(predictions, career_encoder.classes_)
             
-            if not predicted_careers:
-                # If no careers above threshold, take top 3
-                top_indices = np.argsort(prediction)[-3:][::-1]
-                predicted_careers = [career_encoder.classes_[i] for i in top_indices if i < len(career_encoder.classes_)]
+        except Exception as e:
+            return self._get_fallback_career_recommendations_batch(feature_matrix)
+    
+    def _decode_career_prediction(self, prediction, career_labels):
+        """Convert one row of career probabilities to career names"""
+        return self._decode_career_predictions([prediction], career_labels)[0]
+    
+    def _decode_career_predictions(self, predictions, career_labels):
+        """Convert a (rows x careers) probability matrix to a list of career names per row"""
+        career_labels = np.asarray(career_labels, dtype=object)
+        # Outputs beyond the label space never name a career
+        predictions = np.asarray(predictions)[:, :len(career_labels)]
+        
+        # Careers above the threshold in label order, capped per row
+        hits = predictions > self.CAREER_THRESHOLD
+        hit_counts = np.count_nonzero(hits, axis=1)
+        capped = np.flatnonzero(hit_counts > self.MAX_CAREERS)
+        if len(capped):
+            hits[capped] &= np.cumsum(hits[capped], axis=1) <= self.MAX_CAREERS
+        
+        rows, columns = np.nonzero(hits)
+        names = career_labels[columns].tolist()
+        ends = np.cumsum(np.bincount(rows, minlength=len(predictions))).tolist()
+        row_careers = [names[start:end] for start, end in zip([0] + ends[:-1], ends)]
+        
+        # Rows without any career above the threshold take their most probable ones
+        missing = np.flatnonzero(hit_counts == 0)
+        if len(missing):
+            top_columns, _ = top_k_proba(predictions[missing], self.FALLBACK_CAREERS)
+            for row, row_columns in zip(missing.tolist(), career_labels[top_columns].tolist()):
+                row_careers[row] = row_columns
+        
+        return row_careers
+    
+    def _get_similarity_recommendations(self, feature_vector):
+        """Recommend the course and careers most common among students with similar interests"""
+        try:
+            votes = get_similarity_index().recommend(feature_vector)
             
-            return predicted_careers[:5]  # Return top 5 careers
+            if not votes['courses']:
+                return {
+                    'course': self._get_fallback_course_recommendation(feature_vector),
+                    'careers': self._get_fallback_career_recommendations(feature_vector)
+                }
+            
+            return {
+                'course': votes['courses'][0][0],
+                'careers': [career for career, count in votes['careers'][:5]]
+            }
             
         except Exception as e:
-            return self._get_fallback_career_recommendations(feature_vector)
+            return {
+                'course': self._get_fallback_course_recommendation(feature_vector),
+                'careers': self._get_fallback_career_recommendations(feature_vector)
+            }
     
     def _get_fallback_course_recommendation(self, feature_vector):
         """Provide rule-based course recommendations as fallback"""
-        from data.interests_mapping import INTERESTS_LIST
-        
-        active_interests = [INTERESTS_LIST[i] for i, val in enumerate(feature_vector) if val == 1 and i < len(INTERESTS_LIST)]
-        
-        # Rule-based course mapping
-        if any(interest in ['Coding', 'Computer_Parts', 'Mathematics'] for interest in active_interests):
-            return "B.Tech Computer Science Engineering"
-        elif any(interest in ['Drawing', 'Designing', 'Crafting'] for interest in active_interests):
-            return "BFD- Bachelor of Fashion Designing"
-        elif any(interest in ['Economics', 'Accounting', 'Bussiness_Education'] for interest in active_interests):
-            return "BBA- Bachelor of Business Administration"
-        elif any(interest in ['Content_Writing', 'Literature', 'Reading', 'Debating'] for interest in active_interests):
-            return "BJMC- Bachelor of Journalism and Mass Communication"
-        elif any(interest in ['Teaching', 'Psychology', 'Sociology'] for interest in active_interests):
-            return "B.Ed- Bachelor of Education"
-        else:
-            return "Liberal Arts Program - Explore your interests across multiple disciplines"
+        return get_rule_table().recommend_course(feature_vector)
+    
+    def _get_fallback_course_recommendations_batch(self, feature_matrix):
+        """Rule-based course recommendations for every row of a feature matrix"""
+        return get_rule_table().recommend_courses(feature_matrix)
     
     def _get_fallback_career_recommendations(self, feature_vector):
         """Provide rule-based career recommendations as fallback"""
-        from data.interests_mapping import INTERESTS_LIST
-        
-        active_interests = [INTERESTS_LIST[i] for i, val in enumerate(feature_vector) if val == 1 and i < len(INTERESTS_LIST)]
-        
-        careers = []
-        
-        # Rule-based career mapping
-        if any(interest in ['Coding', 'Computer_Parts'] for interest in active_interests):
-            careers.extend(["Software Developer", "Data Scientist", "Systems Analyst"])
-        if any(interest in ['Drawing', 'Designing'] for interest in active_interests):
-            careers.extend(["Graphic Designer", "UI/UX Designer", "Art Director"])
-        if any(interest in ['Economics', 'Accounting'] for interest in active_interests):
-            careers.extend(["Financial Analyst", "Accountant", "Business Consultant"])
-        if any(interest in ['Content_Writing', 'Literature'] for interest in active_interests):
-            careers.extend(["Content Writer", "Journalist", "Editor"])
-        if any(interest in ['Teaching', 'Psychology'] for interest in active_interests):
-            careers.extend(["Teacher", "Counselor", "Training Specialist"])
-        
-        if not careers:
-            careers = ["Career Counselor", "Project Manager", "Research Analyst", "Consultant"]
-        
-        return careers[:5]
+        return get_rule_table().recommend_career_list(feature_vector)
+    
+    def _get_fallback_career_recommendations_batch(self, feature_matrix):
+        """Rule-based career recommendations for every row of a feature matrix"""
+        return get_rule_table().recommend_careers(feature_matrix)
     
     def _get_fallback_recommendations(self, user_profile):
         """Provide basic recommendations when models fail"""
@@ -0,0 +1,203 @@
+"""
+Build an on-disk sentence index of career reference content for the Q&A system.
+
+Meant to run as a scheduled job (e.g. nightly cron): it fetches the configured
+reference sources (CareerQASystem.REFERENCE_URLS and the industry sources of
+utils.web_scraper), splits their text into sentences and writes an inverted
+index. Questions are then answered by BM25 ranking over that index instead of
+scraping pages while the user waits. A rebuilt index is picked up by running
+processes on their next question.
+
+Usage:
+    python -m utils.content_index [--output data/content_index.json] [--deadline 60]
+"""
+import os
+import sys
+import json
+import math
+import time
+import heapq
+import argparse
+from collections import Counter
+from functools import lru_cache
+from data.nlp_resources import STOP_WORDS
+from utils.fast_nlp import tokenize, FastLemmatizer
+from utils.web_scraper import fetch_all, iter_sentences, INDUSTRY_SOURCES
+
+DEFAULT_INDEX_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "content_index.json"
+)
+
+# Sentences with fewer content terms are navigation and headings rather than information
+MIN_SENTENCE_TERMS = 4
+
+# BM25 term frequency saturation and length normalization
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+_lemmatizer = FastLemmatizer()
+
+
+def index_terms(text):
+    """Lemmatized content words of a text, as indexed and as looked up"""
+    return [
+        _lemmatizer.lemmatize(token)
+        for token in tokenize(text.lower())
+        if token not in STOP_WORDS and len(token) > 1
+    ]
+
+
+def reference_urls():
+    """Every configured reference source, without duplicates"""
+    from utils.career_qa_system import CareerQASystem
+
+    urls = list(CareerQASystem.REFERENCE_URLS)
+    for industry_urls in INDUSTRY_SOURCES.values():
+        urls.extend(industry_urls)
+    return list(dict.fromkeys(urls))
+
+
+class ContentIndex:
+    """Inverted index from terms to the sentences containing them, ranked with BM25"""
+
+    def __init__(self, sources, sentences, postings, built_at=None):
+        # sentences: [text, source number] per sentence; postings: term -> [[sentence number, term count], ...]
+        self.sources = sources
+        self.sentences = sentences
+        self.postings = postings
+        self.built_at = built_at
+
+        self.lengths = [0] * len(sentences)
+        for term_postings in postings.values():
+            for sentence_id, count in term_postings:
+                self.lengths[sentence_id] += count
+        self.average_length = sum(self.lengths) / len(sentences) if sentences else 0.0
+
+        total = len(sentences)
+        self.idf = {
+            term: math.log(1 + (total - len(term_postings) + 0.5) / (len(term_postings) + 0.5))
+            for term, term_postings in postings.items()
+        }
+
+    @classmethod
+    def build(cls, pages):
+        """Index the sentences of {url: text}; repeated sentences are kept once"""
+        sources = list(pages)
+        sentences = []
+        postings = {}
+        seen = set()
+
+        for source_id, url in enumerate(sources):
+            for sentence in iter_sentences([pages[url]]):
+                sentence = sentence.strip()
+                terms = index_terms(sentence)
+                if len(terms) < MIN_SENTENCE_TERMS or sentence in seen:
+                    continue
+                seen.add(sentence)
+
+                sentence_id = len(sentences)
+                sentences.append([sentence, source_id])
+                for term, count in Counter(terms).items():
+                    postings.setdefault(term, []).append([sentence_id, count])
+
+        return cls(sources, sentences, postings, built_at=time.time())
+
+    @classmethod
+    def load(cls, path=DEFAULT_INDEX_PATH):
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return cls(data['sources'], data['sentences'], data['postings'], data.get('built_at'))
+
+    def save(self, path=DEFAULT_INDEX_PATH):
+        """Write the index, replacing any previous one atomically"""
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'built_at': self.built_at,
+                'sources': self.sources,
+                'sentences': self.sentences,
+                'postings': self.postings
+            }, f)
+        os.replace(temp_path, path)
+
+    def search(self, question, k=3):
+        """Text of the k sentences ranking highest for a question, best first"""
+        scores = {}
+        for term in set(index_terms(question)):
+            term_postings = self.postings.get(term)
+            if not term_postings:
+                continue
+
+            idf = self.idf[term]
+            for sentence_id, count in term_postings:
+                normalization = BM25_K1 * (1 - BM25_B + BM25_B * self.lengths[sentence_id] / self.average_length)
+                scores[sentence_id] = scores.get(sentence_id, 0.0) + idf * count * (BM25_K1 + 1) / (count + normalization)
+
+        # Ties go to the sentence appearing first in the sources
+        best = heapq.nlargest(k, scores.items(), key=lambda item: (item[1], -item[0]))
+        return [self.sentences[sentence_id][0] for sentence_id, _ in best]
+
+    def stats(self):
+        return {
+            'sources': len(self.sources),
+            'sentences': len(self.sentences),
+            'terms': len(self.postings),
+            'built_at': self.built_at
+        }
+
+
+@lru_cache(maxsize=2)
+def _load_index(path, modified):
+    return ContentIndex.load(path)
+
+
+def get_content_index(path=DEFAULT_INDEX_PATH):
+    """Return the index at path, reloaded whenever the file changes, or None if it has not been built or is empty"""
+    try:
+        modified = os.path.getmtime(path)
+    except OSError:
+        return None
+    index = _load_index(path, modified)
+    return index if index.sentences else None
+
+
+def build_index(urls=None, output=DEFAULT_INDEX_PATH, deadline=60.0):
+    """Fetch the reference sources and write their index; sources that cannot be fetched are left out
+
+    Returns None without writing anything when no sentence could be indexed (network down,
+    every source failing), so a failed crawl keeps the previous index in service.
+    """
+    urls = reference_urls() if urls is None else urls
+    # Ask every source whether it changed, however recently the page cache fetched it;
+    # unchanged pages cost a 304 and are read from the cache
+    pages = fetch_all(urls, deadline=deadline, revalidate=True)
+    if not pages:
+        return None
+
+    index = ContentIndex.build(pages)
+    if not index.sentences:
+        return None
+    index.save(output)
+    return index
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Crawl the career reference sources and index their sentences")
+    parser.add_argument('--output', default=DEFAULT_INDEX_PATH, help="index file to write")
+    parser.add_argument('--deadline', type=float, default=60.0, help="seconds allowed for fetching all sources")
+    parser.add_argument('--url', action='append', dest='urls', help="source to index instead of the configured ones")
+    args = parser.parse_args(argv)
+
+    urls = args.urls or reference_urls()
+    index = build_index(urls, args.output, args.deadline)
+    if index is None:
+        print(f"No source of {len(urls)} could be indexed; {args.output} was left unchanged", file=sys.stderr)
+        return 1
+
+    stats = index.stats()
+    print(f"Indexed {stats['sentences']} sentences from {stats['sources']} of {len(urls)} sources into {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
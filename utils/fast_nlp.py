@@ -0,0 +1,41 @@
+import re
+from data.nlp_resources import (
+    LEMMA_EXCEPTIONS, INVARIANT_LEMMAS, PLURAL_SUFFIX_RULES, NON_PLURAL_ENDINGS
+)
+
+# Alphabetic runs; text is already lowercased and stripped of non-letters before tokenizing
+TOKEN_PATTERN = re.compile(r'[a-z]+')
+
+
+def tokenize(text):
+    """Split lowercased text into word tokens with a regex instead of NLTK's tokenizer"""
+    return TOKEN_PATTERN.findall(text)
+
+
+class FastLemmatizer:
+    """Offline noun lemmatizer backed by a bundled exception table and plural suffix rules"""
+
+    def __init__(self, max_cache_size=50000):
+        self.max_cache_size = max_cache_size
+        self._cache = dict(LEMMA_EXCEPTIONS)
+
+    def lemmatize(self, word):
+        """Return the singular form of a noun, mirroring WordNetLemmatizer.lemmatize defaults"""
+        lemma = self._cache.get(word)
+        if lemma is None:
+            lemma = self._apply_rules(word)
+            if len(self._cache) >= self.max_cache_size:
+                self._cache = dict(LEMMA_EXCEPTIONS)
+            self._cache[word] = lemma
+        return lemma
+
+    def _apply_rules(self, word):
+        """Strip the first matching plural suffix"""
+        if word in INVARIANT_LEMMAS or len(word) <= 3 or word.endswith(NON_PLURAL_ENDINGS):
+            return word
+
+        for suffix, replacement in PLURAL_SUFFIX_RULES:
+            if word.endswith(suffix) and len(word) - len(suffix) + len(replacement) >= 3:
+                return word[:-len(suffix)] + replacement
+
+        return word
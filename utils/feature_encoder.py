@@ -0,0 +1,79 @@
+from types import MappingProxyType
+import numpy as np
+from data.interests_mapping import INTERESTS_LIST
+
+# Width of the model input: one binary column per interest in the dataset
+NUM_FEATURES = len(INTERESTS_LIST)
+
+# Frozen interest name -> feature column lookup, built once at import
+INTEREST_INDEX = MappingProxyType({interest: idx for idx, interest in enumerate(INTERESTS_LIST)})
+
+
+def new_feature_vector():
+    """Create an all-zero feature vector"""
+    return np.zeros(NUM_FEATURES, dtype=np.uint8)
+
+
+def new_feature_matrix(n_rows):
+    """Create an all-zero feature matrix with one row per profile"""
+    return np.zeros((n_rows, NUM_FEATURES), dtype=np.uint8)
+
+
+def encode_interests(interests, out=None):
+    """Set the column of every known interest name in a feature vector"""
+    if out is None:
+        out = new_feature_vector()
+
+    for interest in interests:
+        try:
+            idx = INTEREST_INDEX.get(interest)
+        except TypeError:
+            continue
+        if idx is not None:
+            out[idx] = 1
+
+    return out
+
+
+def encode_profile(user_profile, out=None):
+    """Encode a user profile's selected interests and chat keywords into a feature vector"""
+    if out is None:
+        out = new_feature_vector()
+
+    encode_interests(user_profile.get('selected_interests', ()), out)
+    encode_interests(user_profile.get('chat_keywords', ()), out)
+
+    return out
+
+
+def encode_profiles(profiles):
+    """Encode a sequence of user profiles into a 2-D feature matrix, one row per profile"""
+    profiles = list(profiles)
+    feature_matrix = new_feature_matrix(len(profiles))
+
+    for row, profile in zip(feature_matrix, profiles):
+        encode_profile(profile, out=row)
+
+    return feature_matrix
+
+
+# Bit weight of each feature column when a profile is packed into one integer
+PACKED_BIT_WEIGHTS = np.left_shift(np.uint64(1), np.arange(NUM_FEATURES, dtype=np.uint64))
+
+# Set-bit counts for every byte value, used when numpy has no bitwise_count
+_BYTE_POPCOUNTS = np.array([bin(value).count('1') for value in range(256)], dtype=np.uint8)
+
+
+def pack_features(features):
+    """Pack a feature vector (or each row of a feature matrix) into a uint64 bitmask"""
+    features = np.asarray(features)
+    return (features != 0).astype(np.uint64) @ PACKED_BIT_WEIGHTS
+
+
+def popcount(values):
+    """Count the set bits of each uint64 value"""
+    values = np.asarray(values, dtype=np.uint64)
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(values)
+    as_bytes = values.reshape(values.shape + (1,)).view(np.uint8)
+    return _BYTE_POPCOUNTS[as_bytes].sum(axis=-1, dtype=np.uint8)
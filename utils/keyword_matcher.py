@@ -0,0 +1,109 @@
+from collections import deque
+from data.interests_mapping import INTEREST_KEYWORDS
+
+
+class AhoCorasick:
+    """Multi-pattern substring matcher that scans text once regardless of the number of patterns"""
+
+    def __init__(self, patterns):
+        self.patterns = list(patterns)
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+
+        for pattern_id, pattern in enumerate(self.patterns):
+            if pattern:
+                self._add_pattern(pattern, pattern_id)
+
+        self._build_failure_links()
+
+    def _add_pattern(self, pattern, pattern_id):
+        """Insert a pattern into the trie"""
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = next_state
+        self._output[state].append(pattern_id)
+
+    def _build_failure_links(self):
+        """Compute failure links breadth-first so every state knows its longest proper suffix"""
+        queue = deque(self._goto[0].values())
+
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+
+                # Patterns ending at the suffix state also end here
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def iter_matches(self, text):
+        """Yield (end_position, pattern_id) for every pattern occurrence in text"""
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        state = 0
+
+        for position, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for pattern_id in output[state]:
+                yield position, pattern_id
+
+    def find_all(self, text):
+        """Return the ids of all patterns that occur in text"""
+        return {pattern_id for _, pattern_id in self.iter_matches(text)}
+
+
+class KeywordMatcher:
+    """Precompiled keyword -> interest matcher built once from a keyword mapping"""
+
+    def __init__(self, keyword_mapping):
+        self.interests = list(keyword_mapping)
+
+        keywords = []
+        keyword_interests = {}
+        for interest_position, keywords_for_interest in enumerate(keyword_mapping.values()):
+            for keyword in keywords_for_interest:
+                if keyword not in keyword_interests:
+                    keyword_interests[keyword] = set()
+                    keywords.append(keyword)
+                keyword_interests[keyword].add(interest_position)
+
+        # Inverted index for exact token hits (covers lemmatized forms not present verbatim in the text)
+        self._token_index = {keyword: frozenset(positions) for keyword, positions in keyword_interests.items()}
+
+        # Automaton for substring hits, including multiword phrases like "video game"
+        self._automaton = AhoCorasick(keywords)
+        self._pattern_interests = [self._token_index[keyword] for keyword in keywords]
+
+    def match(self, text_lower, tokens=()):
+        """Return the interests whose keywords appear in the lowercased text or among the tokens"""
+        matched = set()
+
+        for pattern_id in self._automaton.find_all(text_lower):
+            matched.update(self._pattern_interests[pattern_id])
+
+        for token in tokens:
+            positions = self._token_index.get(token)
+            if positions:
+                matched.update(positions)
+
+        return [self.interests[position] for position in sorted(matched)]
+
+
+# Built once at import and shared by every TextProcessor
+INTEREST_MATCHER = KeywordMatcher(INTEREST_KEYWORDS)
@@ -0,0 +1,90 @@
+import threading
+from functools import lru_cache
+import numpy as np
+from utils.feature_encoder import pack_features
+from utils.training_data import DATASET_PATH, load_training_data, collapse_profiles
+
+
+class ProfilePatternTable:
+    """Exact-match lookup of dataset profiles keyed by their packed interest bitmask"""
+
+    def __init__(self, feature_matrix, courses, careers):
+        patterns, row_counts, course_counts, career_counts = collapse_profiles(feature_matrix, courses, careers)
+
+        # Packed bitmask -> (row count, course frequencies, career frequencies)
+        self._table = {
+            int(pattern): (int(row_counts[idx]), course_counts[idx], career_counts[idx])
+            for idx, pattern in enumerate(patterns)
+        }
+        # Packed bitmask -> most frequent course, for batch lookups
+        self._courses = {
+            int(pattern): course_counts[idx].most_common(1)[0][0]
+            for idx, pattern in enumerate(patterns)
+        }
+
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_dataset(cls, path=DATASET_PATH):
+        """Collapse the cleaned dataset CSV into a pattern table"""
+        feature_matrix, courses, careers = load_training_data(path)
+        return cls(feature_matrix, courses, careers)
+
+    def __len__(self):
+        return len(self._table)
+
+    def lookup(self, feature_vector):
+        """Return (row count, course frequencies, career frequencies) for an exact profile match, or None"""
+        entry = self._table.get(int(pack_features(feature_vector)))
+
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        return entry
+
+    def lookup_course(self, feature_vector):
+        """Return the most frequent course for an exact profile match, or None"""
+        entry = self.lookup(feature_vector)
+        if entry is None:
+            return None
+
+        row_count, course_counts, career_counts = entry
+        return course_counts.most_common(1)[0][0]
+
+    def lookup_courses(self, feature_matrix):
+        """Most frequent course of every row's exact profile match, or None, packing the matrix once"""
+        packed_rows = np.atleast_1d(pack_features(feature_matrix)).tolist()
+        courses = [self._courses.get(packed) for packed in packed_rows]
+        hits = len(courses) - courses.count(None)
+
+        with self._lock:
+            self.hits += hits
+            self.misses += len(courses) - hits
+
+        return courses
+
+    @property
+    def hit_rate(self):
+        """Fraction of lookups answered from the table"""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self):
+        """Lookup counters for monitoring"""
+        return {
+            'patterns': len(self._table),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hit_rate
+        }
+
+
+@lru_cache(maxsize=None)
+def get_profile_table(path=DATASET_PATH):
+    """Build the pattern table once per process"""
+    return ProfilePatternTable.from_dataset(path)
@@ -0,0 +1,109 @@
+import re
+from utils.keyword_matcher import AhoCorasick
+
+
+# Regex syntax that ends the literal text at the start of an alternative
+_LITERAL_PREFIX = re.compile(r"[^.^$*+?{}()\[\]|\\]*")
+_QUANTIFIERS = ('*', '+', '?', '{')
+
+
+def _anchor_literals(pattern):
+    """Literal text every match of pattern must start with, one per alternative, or None if unknown"""
+    if any(char in pattern for char in "()[\\"):
+        # Groups and classes can hide a top-level '|'; such patterns are always evaluated
+        return None
+
+    anchors = []
+    for alternative in pattern.split('|'):
+        prefix = _LITERAL_PREFIX.match(alternative).group()
+        if alternative[len(prefix):len(prefix) + 1] in _QUANTIFIERS:
+            # The last literal character is optional or repeated
+            prefix = prefix[:-1]
+        if not prefix:
+            return None
+        anchors.append(prefix)
+    return anchors
+
+
+class IntentClassifier:
+    """Intent patterns indexed by their literal anchors, so a question only runs the patterns it can match
+
+    One Aho-Corasick pass over the anchor literals of every pattern finds which patterns
+    could match, at a cost that does not grow with the number of patterns; only those are
+    then searched. The intent is the first one
+    (in priority order) with a matching pattern, exactly like trying the patterns one by one,
+    and its confidence is the share of that intent's patterns that matched.
+    """
+
+    def __init__(self, intent_patterns, default='general'):
+        self.intents = list(intent_patterns)
+        self.default = default
+
+        # (intent, compiled pattern) per pattern, indexed by pattern id
+        self._patterns = []
+        self._pattern_counts = {}
+        self._always_candidates = []
+        anchor_patterns = {}
+
+        for intent, patterns in intent_patterns.items():
+            self._pattern_counts[intent] = len(patterns)
+            for pattern in patterns:
+                pattern_id = len(self._patterns)
+                self._patterns.append((intent, re.compile(pattern)))
+
+                anchors = _anchor_literals(pattern)
+                if anchors is None:
+                    self._always_candidates.append(pattern_id)
+                    continue
+                for anchor in anchors:
+                    anchor_patterns.setdefault(anchor, set()).add(pattern_id)
+
+        anchors = list(anchor_patterns)
+        self._anchor_matcher = AhoCorasick(anchors)
+        self._candidates_by_anchor = [frozenset(anchor_patterns[anchor]) for anchor in anchors]
+
+    def scores(self, text):
+        """Share of each intent's patterns found in text, for intents with at least one match"""
+        candidates = set(self._always_candidates)
+        for anchor_id in self._anchor_matcher.find_all(text):
+            candidates |= self._candidates_by_anchor[anchor_id]
+
+        hits = {}
+        for pattern_id in candidates:
+            intent, compiled = self._patterns[pattern_id]
+            if compiled.search(text):
+                hits[intent] = hits.get(intent, 0) + 1
+
+        return {intent: count / self._pattern_counts[intent] for intent, count in hits.items()}
+
+    def classify(self, text):
+        """Return (intent, confidence, scores of all matching intents) for lower-cased text"""
+        scores = self.scores(text)
+        for intent in self.intents:
+            if intent in scores:
+                return intent, scores[intent], scores
+        return self.default, 0.0, scores
+
+
+class EntityMatcher:
+    """Finds which terms of several term lists occur in a text with one Aho-Corasick pass"""
+
+    def __init__(self, term_lists):
+        self.term_lists = {category: list(terms) for category, terms in term_lists.items()}
+
+        # One automaton over every term; a term listed in two categories is reported in both
+        self._terms = []
+        self._owners = []
+        for category, terms in self.term_lists.items():
+            for position, term in enumerate(terms):
+                self._terms.append(term)
+                self._owners.append((category, position))
+        self._automaton = AhoCorasick(self._terms)
+
+    def match(self, text):
+        """Terms of each category that occur in text as substrings, in term list order"""
+        found = {category: [] for category in self.term_lists}
+        for term_id in sorted(self._automaton.find_all(text), key=self._owners.__getitem__):
+            category, position = self._owners[term_id]
+            found[category].append(self._terms[term_id])
+        return found
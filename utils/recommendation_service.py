@@ -0,0 +1,315 @@
+"""
+Internal HTTP API for the recommender, without Streamlit.
+
+Endpoints (JSON in, JSON out):
+    POST /recommend  {"selected_interests": [...], "chat_keywords": [...]}
+                     or {"profiles": [{...}, ...]}
+    POST /ask        {"question": "..."}
+    GET  /health     batching and answer cache statistics
+
+Concurrent /recommend requests are collected into micro-batches: the first
+request opens a window of at most --max-latency-ms, and the batch is scored
+with one get_recommendations_batch call as soon as it is full or the window
+closes. Under load batches fill up, so throughput grows with traffic instead
+of paying one model call per request.
+
+Usage:
+    python -m utils.recommendation_service [--host 127.0.0.1] [--port 8000]
+        [--max-batch-size 64] [--max-latency-ms 5]
+"""
+import sys
+import json
+import time
+import asyncio
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+
+# Largest request body accepted, in bytes
+MAX_BODY_SIZE = 1 << 20
+
+
+class MicroBatcher:
+    """Groups items submitted by concurrent coroutines and processes each group with one call"""
+
+    def __init__(self, process_batch, max_batch_size=64, max_latency=0.005, executor=None):
+        if max_batch_size < 1:
+            raise ValueError(f"max_batch_size must be at least 1, got {max_batch_size}")
+
+        self.process_batch = process_batch
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency
+        # Batches run one at a time off the event loop; requests queue up meanwhile and form the next batch
+        self.executor = executor or ThreadPoolExecutor(max_workers=1, thread_name_prefix="micro-batch")
+        self.batches = 0
+        self.items = 0
+        self._queue = None
+        self._worker = None
+        # Submission taken from the queue that did not fit the previous batch; it opens the next one
+        self._held = None
+
+    def start(self):
+        if self._worker is None:
+            self._queue = asyncio.Queue()
+            self._held = None
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+    async def submit(self, items):
+        """Queue a list of items and wait for their results, in order
+
+        Lists longer than max_batch_size are queued in slices, so no call exceeds the cap.
+        """
+        self.start()
+        loop = asyncio.get_running_loop()
+        futures = []
+        for start in range(0, len(items), self.max_batch_size):
+            future = loop.create_future()
+            await self._queue.put((items[start:start + self.max_batch_size], future))
+            futures.append(future)
+
+        # Every slice is awaited, so a failed batch leaves no exception unretrieved
+        results = await asyncio.gather(*futures, return_exceptions=True)
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        return [item for result in results for item in result]
+
+    async def _collect(self):
+        """Wait for one submission, then take more while they fit the batch and the latency budget lasts"""
+        if self._held is not None:
+            batch, self._held = [self._held], None
+        else:
+            batch = [await self._queue.get()]
+        size = len(batch[0][0])
+        deadline = time.monotonic() + self.max_latency
+
+        while size < self.max_batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                entry = await asyncio.wait_for(self._queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+
+            if size + len(entry[0]) > self.max_batch_size:
+                self._held = entry
+                break
+            batch.append(entry)
+            size += len(entry[0])
+
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            items = [item for submitted, future in batch for item in submitted]
+
+            try:
+                results = await loop.run_in_executor(self.executor, self.process_batch, items)
+            except Exception as e:
+                for submitted, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            self.batches += 1
+            self.items += len(items)
+
+            # Hand each submitter back its own slice of the batch results
+            offset = 0
+            for submitted, future in batch:
+                if not future.done():
+                    future.set_result(results[offset:offset + len(submitted)])
+                offset += len(submitted)
+
+    def stats(self):
+        return {
+            'batches': self.batches,
+            'items': self.items,
+            'mean_batch_size': self.items / self.batches if self.batches else 0.0,
+            'max_batch_size': self.max_batch_size,
+            'max_latency_ms': self.max_latency * 1000.0,
+        }
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message=None):
+        super().__init__(message or status.phrase)
+        self.status = status
+
+
+class RecommendationService:
+    """Minimal asyncio HTTP/1.1 server routing JSON requests to the recommender and the Q&A system"""
+
+    def __init__(self, recommender=None, qa_system=None, max_batch_size=64, max_latency=0.005):
+        if recommender is None:
+            from utils.career_recommender import CareerRecommender
+            recommender = CareerRecommender()
+        if qa_system is None:
+            from utils.career_qa_system import CareerQASystem
+            qa_system = CareerQASystem()
+
+        self.recommender = recommender
+        self.qa_system = qa_system
+        self.batcher = MicroBatcher(recommender.get_recommendations_batch, max_batch_size, max_latency)
+        self.routes = {
+            ('POST', '/recommend'): self.handle_recommend,
+            ('POST', '/ask'): self.handle_ask,
+            ('GET', '/health'): self.handle_health,
+        }
+
+    # Profile fields the recommender reads, each a list of strings
+    PROFILE_FIELDS = ('selected_interests', 'chat_keywords')
+
+    def _check_profile(self, profile):
+        """Reject a malformed profile before it joins a shared batch, where it would fail every request in it"""
+        if not isinstance(profile, dict):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Each profile must be a JSON object")
+        for field in self.PROFILE_FIELDS:
+            values = profile.get(field, [])
+            if not isinstance(values, list) or not all(isinstance(value, str) for value in values):
+                raise HTTPError(HTTPStatus.BAD_REQUEST, f"'{field}' must be a list of strings")
+        return profile
+
+    async def handle_recommend(self, payload):
+        if 'profiles' in payload:
+            profiles = payload['profiles']
+            if not isinstance(profiles, list):
+                raise HTTPError(HTTPStatus.BAD_REQUEST, "'profiles' must be a list of objects")
+            profiles = [self._check_profile(profile) for profile in profiles]
+            return {'recommendations': await self.batcher.submit(profiles)}
+
+        return (await self.batcher.submit([self._check_profile(payload)]))[0]
+
+    async def handle_ask(self, payload):
+        question = payload.get('question')
+        if not isinstance(question, str) or not question.strip():
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "'question' must be a non-empty string")
+
+        # Answers are plain Python string work; keep them off the event loop
+        loop = asyncio.get_running_loop()
+        question_type, answer = await loop.run_in_executor(None, self.qa_system.answer_question, question)
+        return {'type': question_type, 'answer': answer}
+
+    async def handle_health(self, payload):
+        return {'status': 'ok', 'batching': self.batcher.stats(), 'answers': self.qa_system.answer_cache_stats()}
+
+    async def _read_request(self, reader):
+        """Parse one request into (method, path, headers, body), or None when the client closed"""
+        request_line = await reader.readline()
+        if not request_line:
+            return None
+
+        try:
+            method, target, version = request_line.decode('latin-1').split()
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Malformed request line")
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        try:
+            length = int(headers.get('content-length') or 0)
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Content-Length must be a number")
+        if length < 0:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Content-Length must not be negative")
+        if length > MAX_BODY_SIZE:
+            raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+        body = await reader.readexactly(length) if length else b''
+
+        return method.upper(), target.split('?', 1)[0], headers, body, version
+
+    def _response(self, status, payload, keep_alive):
+        body = json.dumps(payload).encode('utf-8')
+        head = (
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        return head.encode('latin-1') + body
+
+    async def handle_connection(self, reader, writer):
+        """Serve requests on one connection until the client closes it or asks to"""
+        try:
+            while True:
+                keep_alive = False
+                try:
+                    request = await self._read_request(reader)
+                    if request is None:
+                        break
+                    method, path, headers, body, version = request
+                    connection = headers.get('connection', '').lower()
+                    keep_alive = connection == 'keep-alive' or (version == 'HTTP/1.1' and connection != 'close')
+
+                    handler = self.routes.get((method, path))
+                    if handler is None:
+                        known_path = any(route_path == path for _, route_path in self.routes)
+                        raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED if known_path else HTTPStatus.NOT_FOUND)
+
+                    try:
+                        payload = json.loads(body) if body else {}
+                    except ValueError:
+                        raise HTTPError(HTTPStatus.BAD_REQUEST, "Body must be valid JSON")
+                    if not isinstance(payload, dict):
+                        raise HTTPError(HTTPStatus.BAD_REQUEST, "Body must be a JSON object")
+
+                    status, result = HTTPStatus.OK, await handler(payload)
+                except HTTPError as e:
+                    status, result = e.status, {'error': str(e)}
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except Exception as e:
+                    status, result = HTTPStatus.INTERNAL_SERVER_ERROR, {'error': str(e)}
+
+                writer.write(self._response(status, result, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        finally:
+            writer.close()
+
+    async def serve(self, host='127.0.0.1', port=8000):
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        self.batcher.start()
+        async with server:
+            await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve career recommendations over HTTP")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--max-batch-size', type=int, default=64, help="most profiles scored per model call")
+    parser.add_argument('--max-latency-ms', type=float, default=5.0,
+                        help="longest a request waits for others to join its batch")
+    args = parser.parse_args(argv)
+
+    service = RecommendationService(max_batch_size=args.max_batch_size, max_latency=args.max_latency_ms / 1000.0)
+    print(f"Serving on http://{args.host}:{args.port}")
+    try:
+        asyncio.run(service.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+import os
+import json
+from functools import lru_cache
+import numpy as np
+from utils.feature_encoder import INTEREST_INDEX, PACKED_BIT_WEIGHTS, pack_features
+
+# Rule table used for fallback recommendations when the trained models are unavailable
+DEFAULT_RULES_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "recommendation_rules.json"
+)
+
+
+def compile_mask(interests):
+    """Bitmask over the packed feature columns of a list of interest names"""
+    unknown = [interest for interest in interests if interest not in INTEREST_INDEX]
+    if unknown:
+        raise ValueError(f"Unknown interests in rule: {', '.join(unknown)}")
+
+    mask = np.uint64(0)
+    for interest in interests:
+        mask |= PACKED_BIT_WEIGHTS[INTEREST_INDEX[interest]]
+    return mask
+
+
+class RuleTable:
+    """Declarative fallback rules compiled to bitmasks, so each rule is one AND against a packed profile
+
+    Course rules are ordered and the first match wins; career rules all apply and their careers
+    are concatenated in rule order, capped at max_careers.
+    """
+
+    def __init__(self, course_rules, default_course, career_rules, default_careers, max_careers=5):
+        self.course_masks = np.array([compile_mask(rule['any_of']) for rule in course_rules], dtype=np.uint64)
+        self.courses = [rule['course'] for rule in course_rules]
+        self.default_course = default_course
+
+        self.career_masks = np.array([compile_mask(rule['any_of']) for rule in career_rules], dtype=np.uint64)
+        self.career_lists = [list(rule['careers']) for rule in career_rules]
+        self.default_careers = list(default_careers)
+        self.max_careers = max_careers
+
+        # Combined career list per set of matching rules, built on first use
+        self._career_combinations = {}
+
+    @classmethod
+    def from_dict(cls, rules):
+        return cls(
+            rules.get('course_rules', []),
+            rules['default_course'],
+            rules.get('career_rules', []),
+            rules['default_careers'],
+            rules.get('max_careers', 5)
+        )
+
+    @classmethod
+    def from_file(cls, path=DEFAULT_RULES_PATH):
+        """Load and compile a JSON rule file"""
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
+
+    def _matches(self, feature_matrix, masks):
+        """Boolean (rows, rules) matrix of which rules each profile triggers"""
+        packed = np.atleast_1d(pack_features(feature_matrix))
+        return (packed[:, None] & masks[None, :]) != 0
+
+    def recommend_courses(self, feature_matrix):
+        """Course of the first matching rule for every row of a feature matrix"""
+        feature_matrix = np.atleast_2d(feature_matrix)
+        if not len(self.course_masks):
+            return [self.default_course] * len(feature_matrix)
+
+        matches = self._matches(feature_matrix, self.course_masks)
+        first_rule = matches.argmax(axis=1)
+        matched = matches.any(axis=1)
+
+        return [
+            self.courses[rule] if is_matched else self.default_course
+            for rule, is_matched in zip(first_rule, matched)
+        ]
+
+    def recommend_careers(self, feature_matrix):
+        """Careers of every matching rule for every row of a feature matrix"""
+        feature_matrix = np.atleast_2d(feature_matrix)
+        if not len(self.career_masks):
+            return [list(self.default_careers[:self.max_careers]) for _ in feature_matrix]
+
+        # Encode which rules matched as packed bytes per row (any number of rules), then decode
+        # each distinct combination once
+        matches = self._matches(feature_matrix, self.career_masks)
+        combinations = np.packbits(matches, axis=1, bitorder='little')
+        unique_combinations, inverse = np.unique(combinations, axis=0, return_inverse=True)
+
+        careers = [self._careers_for(combination.tobytes()) for combination in unique_combinations]
+        return [list(careers[i]) for i in np.asarray(inverse).reshape(-1)]
+
+    def _careers_for(self, combination):
+        """Capped career list for the packed match bits of the career rules"""
+        careers = self._career_combinations.get(combination)
+        if careers is None:
+            matched = np.unpackbits(np.frombuffer(combination, dtype=np.uint8), bitorder='little')
+            careers = []
+            for rule in np.flatnonzero(matched[:len(self.career_lists)]):
+                careers.extend(self.career_lists[rule])
+            careers = tuple((careers or self.default_careers)[:self.max_careers])
+            self._career_combinations[combination] = careers
+        return careers
+
+    def recommend_course(self, feature_vector):
+        """Course of the first matching rule for one feature vector"""
+        return self.recommend_courses(feature_vector)[0]
+
+    def recommend_career_list(self, feature_vector):
+        """Careers of every matching rule for one feature vector"""
+        return self.recommend_careers(feature_vector)[0]
+
+
+@lru_cache(maxsize=None)
+def get_rule_table(path=DEFAULT_RULES_PATH):
+    """Return the compiled rule table for a rule file, loading it once per process"""
+    return RuleTable.from_file(path)
@@ -0,0 +1,232 @@
+"""
+Nearest-neighbour ("students like you") search over the training dataset's interest profiles.
+
+Run as a script, it benchmarks query latency on random distinct profiles, checking
+every result against a brute-force scan of all patterns.
+
+Usage:
+    python -m utils.similarity_index [--patterns 350000] [--queries 1000] [--metric jaccard] [--seed 0]
+"""
+import sys
+import time
+import argparse
+from collections import Counter
+from functools import lru_cache
+import numpy as np
+from utils.feature_encoder import NUM_FEATURES, PACKED_BIT_WEIGHTS, pack_features, popcount
+from utils.training_data import DATASET_PATH, load_training_data, collapse_profiles
+
+
+class SimilarityIndex:
+    """Nearest-neighbour ("students like you") search over bit-packed interest profiles"""
+
+    METRICS = ('jaccard', 'hamming')
+
+    def __init__(self, feature_matrix, courses, careers, metric='jaccard'):
+        if metric not in self.METRICS:
+            raise ValueError(f"Unknown similarity metric: {metric}")
+
+        self.metric = metric
+
+        # Identical profiles are stored once with their row count and label votes
+        patterns, row_counts, course_counts, career_counts = collapse_profiles(feature_matrix, courses, careers)
+
+        # Patterns are ordered by bit count, so each count is one contiguous group a query can skip
+        order = np.argsort(popcount(patterns), kind='stable')
+        self.patterns = patterns[order]
+        self.pattern_bits = popcount(self.patterns)
+        self.group_starts = np.searchsorted(self.pattern_bits, np.arange(NUM_FEATURES + 2)).tolist()
+        self.row_counts = row_counts[order]
+        self.course_counts = [course_counts[idx] for idx in order]
+        self.career_counts = [career_counts[idx] for idx in order]
+        self.n_rows = int(row_counts.sum())
+
+    @classmethod
+    def from_dataset(cls, path=DATASET_PATH, metric='jaccard'):
+        """Build an index from the cleaned dataset CSV"""
+        feature_matrix, courses, careers = load_training_data(path)
+        return cls(feature_matrix, courses, careers, metric=metric)
+
+    def similarities(self, feature_vector):
+        """Similarity of a profile to every stored pattern"""
+        query = np.uint64(pack_features(feature_vector))
+
+        # Bit counts stay uint8 until the single division into float32
+        if self.metric == 'hamming':
+            matching = NUM_FEATURES - popcount(self.patterns ^ query)
+            return np.divide(matching, NUM_FEATURES, dtype=np.float32)
+
+        intersection = popcount(self.patterns & query)
+        union = self.pattern_bits + popcount(query)
+        union -= intersection
+        np.maximum(union, 1, out=union)
+        return np.divide(intersection, union, dtype=np.float32)
+
+    def _group_bound(self, bits, query_bits):
+        """(numerator, denominator) of the best similarity any pattern with the given bit count can reach"""
+        if self.metric == 'hamming':
+            return NUM_FEATURES - abs(bits - query_bits), NUM_FEATURES
+        return min(bits, query_bits), max(bits, query_bits, 1)
+
+    def _group_scores(self, query, group):
+        """Integer score of every pattern of one bit-count group, increasing with similarity
+
+        Within a group the similarity is a function of this score alone: the matching
+        bits for hamming, the intersection for jaccard (the union shrinks as it grows).
+        """
+        if self.metric == 'hamming':
+            return NUM_FEATURES - popcount(group ^ query)
+        return popcount(group & query)
+
+    def _score_fraction(self, bits, query_bits, scores):
+        """(numerators, denominators) of the similarities of a group's scores"""
+        if self.metric == 'hamming':
+            return scores, np.full(len(scores), NUM_FEATURES)
+        return scores, np.maximum(bits + query_bits - scores, 1)
+
+    def _min_score(self, bits, query_bits, numerator, denominator):
+        """Smallest score of a group whose similarity exceeds numerator / denominator"""
+        if self.metric == 'hamming':
+            # score / NUM_FEATURES > n / d
+            return numerator * NUM_FEATURES // denominator + 1
+        # score / (bits + query_bits - score) > n / d, cross-multiplied
+        return numerator * (bits + query_bits) // (numerator + denominator) + 1
+
+    def query(self, feature_vector, k=10):
+        """Return (pattern indices, similarities) of the closest patterns covering at least k dataset rows
+
+        Groups of patterns are visited from the highest similarity they could reach down, and
+        the search stops once no remaining group can beat the k-th best pattern found so far.
+        Within a group, patterns are filtered on an integer score threshold, so only the few
+        candidates left are ever turned into similarities.
+        """
+        query = np.uint64(pack_features(feature_vector))
+        query_bits = int(popcount(query))
+        # Every pattern holds at least one row, so the k best patterns always cover k rows
+        n_best = min(k, len(self.patterns))
+
+        groups = [bits for bits in range(NUM_FEATURES + 1)
+                  if self.group_starts[bits] < self.group_starts[bits + 1]]
+        bounds = {bits: self._group_bound(bits, query_bits) for bits in groups}
+        groups.sort(key=lambda bits: bounds[bits][0] / bounds[bits][1], reverse=True)
+
+        best = np.empty(0, dtype=np.intp)
+        numerators = np.empty(0, dtype=np.int64)
+        denominators = np.empty(0, dtype=np.int64)
+        for bits in groups:
+            full = len(best) == n_best
+            if full:
+                # k-th best so far; a group bounded at or below it cannot improve the result
+                numerator, denominator = int(numerators[-1]), int(denominators[-1])
+                bound_numerator, bound_denominator = bounds[bits]
+                if bound_numerator * denominator <= numerator * bound_denominator:
+                    break
+
+            start, end = self.group_starts[bits], self.group_starts[bits + 1]
+            scores = self._group_scores(query, self.patterns[start:end])
+            if full:
+                # Patterns merely tying the k-th best cannot change the result
+                candidates = np.flatnonzero(scores >= self._min_score(bits, query_bits, numerator, denominator))
+            elif len(scores) > n_best:
+                candidates = np.argpartition(scores, len(scores) - n_best)[len(scores) - n_best:]
+            else:
+                candidates = np.arange(len(scores))
+            if not len(candidates):
+                continue
+
+            group_numerators, group_denominators = self._score_fraction(bits, query_bits, scores[candidates])
+            best = np.concatenate([best, start + candidates])
+            numerators = np.concatenate([numerators, group_numerators])
+            denominators = np.concatenate([denominators, group_denominators])
+
+            # Denominators stay below 2 * NUM_FEATURES, so float64 ranks these fractions exactly
+            order = np.argsort(-(numerators / denominators), kind='stable')[:n_best]
+            best, numerators, denominators = best[order], numerators[order], denominators[order]
+
+        covered = np.cumsum(self.row_counts[best])
+        n_taken = int(np.searchsorted(covered, k)) + 1
+
+        return best[:n_taken], (numerators / denominators)[:n_taken]
+
+    def recommend(self, feature_vector, k=10):
+        """Vote over the k most similar students' courses and career options"""
+        selected, similarity = self.query(feature_vector, k)
+
+        course_votes = Counter()
+        career_votes = Counter()
+        for pattern_idx in selected:
+            course_votes.update(self.course_counts[pattern_idx])
+            career_votes.update(self.career_counts[pattern_idx])
+
+        return {
+            'neighbours': int(self.row_counts[selected].sum()),
+            'similarity': float(similarity.max()) if len(similarity) else 0.0,
+            'courses': course_votes.most_common(),
+            'careers': career_votes.most_common()
+        }
+
+    def recommend_batch(self, feature_matrix, k=10):
+        """Vote over the most similar students for every row of a feature matrix"""
+        return [self.recommend(row, k) for row in feature_matrix]
+
+
+@lru_cache(maxsize=None)
+def get_similarity_index(path=DATASET_PATH, metric='jaccard'):
+    """Build the similarity index once per process"""
+    return SimilarityIndex.from_dataset(path, metric=metric)
+
+
+def random_distinct_profiles(n_profiles, seed=0):
+    """Feature matrix of n_profiles distinct random profiles, each selecting 5-30% of the interests"""
+    rng = np.random.default_rng(seed)
+    packed = np.empty(0, dtype=np.uint64)
+    while len(packed) < n_profiles:
+        density = rng.uniform(0.05, 0.3, (n_profiles, 1))
+        rows = (rng.random((n_profiles, NUM_FEATURES)) < density).astype(np.uint64) @ PACKED_BIT_WEIGHTS
+        packed = np.unique(np.concatenate([packed, rows]))
+    packed = rng.permutation(packed)[:n_profiles]
+    return ((packed[:, None] & PACKED_BIT_WEIGHTS) != 0).astype(np.uint8)
+
+
+def benchmark(n_patterns=350000, n_queries=1000, metric='jaccard', k=10, seed=0):
+    """Mean and worst query latency, in ms, over an index of n_patterns distinct random profiles"""
+    feature_matrix = random_distinct_profiles(n_patterns, seed)
+    index = SimilarityIndex(feature_matrix, ['course'] * n_patterns, [['career']] * n_patterns, metric=metric)
+
+    rng = np.random.default_rng(seed + 1)
+    queries = (rng.random((n_queries, NUM_FEATURES)) < rng.uniform(0.0, 0.6, (n_queries, 1))).astype(np.uint8)
+
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        selected, similarity = index.query(query, k)
+        latencies.append(time.perf_counter() - start)
+
+        expected = np.sort(index.similarities(query))[::-1][:len(selected)]
+        if not np.allclose(similarity, expected, atol=1e-6):
+            raise AssertionError(f"Query result differs from a full scan for {np.flatnonzero(query).tolist()}")
+
+    return {
+        'patterns': len(index.patterns),
+        'queries': n_queries,
+        'mean_ms': float(np.mean(latencies)) * 1000.0,
+        'max_ms': float(np.max(latencies)) * 1000.0,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark similarity queries on random distinct profiles")
+    parser.add_argument('--patterns', type=int, default=350000, help="distinct profiles in the index")
+    parser.add_argument('--queries', type=int, default=1000, help="random queries to time")
+    parser.add_argument('--metric', choices=SimilarityIndex.METRICS, default='jaccard')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    result = benchmark(args.patterns, args.queries, args.metric, seed=args.seed)
+    print(f"{result['queries']} {args.metric} queries over {result['patterns']} distinct patterns: "
+          f"{result['mean_ms']:.3f} ms mean, {result['max_ms']:.3f} ms worst")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
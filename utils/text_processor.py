@@ -5,7 +5,10 @@ from nltk.tokenize import word_tokenize, sent_tokenize
 from nltk.stem import WordNetLemmatizer
 from nltk.tag import pos_tag
 from nltk.chunk import ne_chunk
-from data.interests_mapping import INTEREST_KEYWORDS
+from utils.feature_encoder import encode_interests
+from utils.keyword_matcher import INTEREST_MATCHER
+from utils.fast_nlp import FastLemmatizer, tokenize as fast_tokenize
+from data.nlp_resources import STOP_WORDS
 import streamlit as st
 from collections import Counter
 
@@ -37,44 +40,83 @@ def download_nltk_data():
         nltk.download('maxent_ne_chunker')
         nltk.download('words')
 
+# Anything that is not a letter or whitespace is dropped before tokenizing
+NON_ALPHA_PATTERN = re.compile(r'[^a-zA-Z\s]')
+
+class AnalyzedMessage:
+    """NLP analysis of one message, computed once and shared by every TextProcessor extractor"""
+    def __init__(self, text, text_lower, tokens, lemmas, content_words, ngrams):
+        self.text = text
+        self.text_lower = text_lower
+        self.tokens = tokens
+        self.lemmas = lemmas
+        self.content_words = content_words
+        self.ngrams = ngrams
+
 class TextProcessor:
-    def __init__(self):
-        download_nltk_data()
-        self.lemmatizer = WordNetLemmatizer()
-        self.stop_words = set(stopwords.words('english'))
+    MODES = ('nltk', 'fast')
+    
+    def __init__(self, mode='nltk'):
+        """Create a text processor; 'fast' mode works fully offline without NLTK data"""
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown text processing mode: {mode}")
+        
+        self.mode = mode
+        if mode == 'fast':
+            self.lemmatizer = FastLemmatizer()
+            self.stop_words = STOP_WORDS
+        else:
+            download_nltk_data()
+            self.lemmatizer = WordNetLemmatizer()
+            self.stop_words = set(stopwords.words('english'))
+    
+    def tokenize(self, text):
+        """Split text into word tokens using the configured tokenizer"""
+        if self.mode == 'fast':
+            return fast_tokenize(text)
+        return word_tokenize(text)
+        
+    def analyze(self, text):
+        """Lowercase, clean, tokenize and lemmatize a message once for all extractors"""
+        if isinstance(text, AnalyzedMessage):
+            return text
         
-    def preprocess_text(self, text):
-        """Clean and preprocess text"""
         # Convert to lowercase
-        text = text.lower()
+        text_lower = text.lower()
         
         # Remove special characters and digits
-        text = re.sub(r'[^a-zA-Z\s]', '', text)
+        cleaned_text = NON_ALPHA_PATTERN.sub('', text_lower)
         
         # Tokenize
-        tokens = word_tokenize(text)
+        tokens = self.tokenize(cleaned_text)
         
         # Remove stopwords and lemmatize
-        processed_tokens = [
+        lemmas = [
             self.lemmatizer.lemmatize(token) 
             for token in tokens 
             if token not in self.stop_words and len(token) > 2
         ]
         
-        return processed_tokens
+        # Bigrams and trigrams over the non-stopword tokens
+        content_words = [token for token in tokens if token not in self.stop_words]
+        ngrams = [f"{content_words[i]} {content_words[i+1]}" 
+                  for i in range(len(content_words)-1)]
+        ngrams += [f"{content_words[i]} {content_words[i+1]} {content_words[i+2]}" 
+                   for i in range(len(content_words)-2)]
+        
+        return AnalyzedMessage(text, text_lower, tokens, lemmas, content_words, ngrams)
+    
+    def preprocess_text(self, text):
+        """Clean and preprocess text"""
+        return self.analyze(text).lemmas
     
     def extract_keywords(self, text):
         """Extract relevant keywords from user input"""
-        processed_tokens = self.preprocess_text(text)
-        
-        # Find matches with predefined interest keywords
-        matched_keywords = []
+        message = self.analyze(text)
+        processed_tokens = message.lemmas
         
-        for interest, keywords in INTEREST_KEYWORDS.items():
-            for keyword in keywords:
-                if keyword in processed_tokens or keyword in text.lower():
-                    matched_keywords.append(interest)
-                    break
+        # Find matches with predefined interest keywords in a single pass over the text
+        matched_keywords = INTEREST_MATCHER.match(message.text_lower, processed_tokens)
         
         # Also include significant tokens that might be relevant
         significant_tokens = [
@@ -89,43 +131,19 @@ class TextProcessor:
     
     def text_to_feature_vector(self, text, user_profile=None):
         """Convert text input to feature vector for model prediction"""
-        # Initialize feature vector with zeros (59 features based on dataset)
-        feature_vector = [0] * 59
-        
-        # Extract keywords from text
-        keywords = self.extract_keywords(text)
-        
-        # Map keywords to feature indices
-        for keyword in keywords:
-            if keyword in INTEREST_KEYWORDS:
-                # Find the index of this interest in the feature vector
-                try:
-                    from data.interests_mapping import INTERESTS_LIST
-                    if keyword in INTERESTS_LIST:
-                        idx = INTERESTS_LIST.index(keyword)
-                        if idx < len(feature_vector):
-                            feature_vector[idx] = 1
-                except (ValueError, IndexError):
-                    continue
+        # Map extracted keywords that name an interest to their feature columns
+        feature_vector = encode_interests(self.extract_keywords(text))
         
         # Include selected interests from user profile
         if user_profile and 'selected_interests' in user_profile:
-            for interest in user_profile['selected_interests']:
-                try:
-                    from data.interests_mapping import INTERESTS_LIST
-                    if interest in INTERESTS_LIST:
-                        idx = INTERESTS_LIST.index(interest)
-                        if idx < len(feature_vector):
-                            feature_vector[idx] = 1
-                except (ValueError, IndexError):
-                    continue
+            encode_interests(user_profile['selected_interests'], feature_vector)
         
         return feature_vector
     
     def extract_named_entities(self, text):
         """Extract named entities from text using NLTK"""
         try:
-            tokens = word_tokenize(text)
+            tokens = word_tokenize(self.analyze(text).text)
             pos_tags = pos_tag(tokens)
             named_entities = ne_chunk(pos_tags)
             
@@ -144,7 +162,7 @@ class TextProcessor:
         positive_words = ['love', 'enjoy', 'like', 'passionate', 'excited', 'interested', 'good', 'great', 'amazing']
         negative_words = ['hate', 'dislike', 'boring', 'difficult', 'hard', 'bad', 'terrible', 'awful']
         
-        words = self.preprocess_text(text)
+        words = self.analyze(text).lemmas
         
         positive_count = sum(1 for word in words if word in positive_words)
         negative_count = sum(1 for word in words if word in negative_words)
@@ -166,7 +184,7 @@ class TextProcessor:
             'goals': ['want', 'goal', 'aspire', 'dream', 'hope', 'plan', 'future']
         }
         
-        words = self.preprocess_text(text)
+        words = self.analyze(text).lemmas
         found_terms = {}
         
         for category, terms in career_terms.items():
@@ -177,7 +195,10 @@ class TextProcessor:
     def get_question_type(self, text):
         """Identify if the text is a question and what type"""
         question_words = ['what', 'how', 'why', 'when', 'where', 'which', 'who']
-        text_lower = text.lower()
+        if isinstance(text, AnalyzedMessage):
+            text, text_lower = text.text, text.text_lower
+        else:
+            text_lower = text.lower()
         
         if text.endswith('?'):
             return 'question'
@@ -192,19 +213,10 @@ class TextProcessor:
     
     def extract_key_phrases(self, text):
         """Extract key phrases using simple n-gram analysis"""
-        words = word_tokenize(text.lower())
-        
-        # Remove stopwords and non-alphabetic tokens
-        filtered_words = [word for word in words if word.isalpha() and word not in self.stop_words]
-        
-        # Get bigrams and trigrams
-        bigrams = [f"{filtered_words[i]} {filtered_words[i+1]}" 
-                  for i in range(len(filtered_words)-1)]
-        trigrams = [f"{filtered_words[i]} {filtered_words[i+1]} {filtered_words[i+2]}" 
-                   for i in range(len(filtered_words)-2)]
+        message = self.analyze(text)
         
         # Count frequency
-        all_phrases = filtered_words + bigrams + trigrams
+        all_phrases = message.content_words + message.ngrams
         phrase_freq = Counter(all_phrases)
         
         # Return top phrases
@@ -0,0 +1,63 @@
+import os
+from collections import Counter
+import numpy as np
+import pandas as pd
+from data.interests_mapping import INTERESTS_LIST
+from utils.feature_encoder import NUM_FEATURES, pack_features
+
+# Repository root, so the dataset resolves regardless of the working directory
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DATASET_PATH = os.path.join(PROJECT_ROOT, "dataset", "cleaned_dataset.csv")
+
+# Dataset column each feature was trained on, where it differs from the interest name:
+# the CSV misspells some interests, and the models learned four columns by position
+DATASET_COLUMN_NAMES = {
+    'Psychology': 'Psycology',
+    'Astrology': 'Asrtology',
+    'Other_Language': 'Other Language',
+    'Makeup_Artist': 'Solving_Puzzles',
+    'Mechanic': 'Gymnastics',
+    'Model': 'Yoga',
+    'Sales': 'Engeeniering',
+    'Pharmacist': 'Pharmisist',
+    'Business': 'Bussiness',
+}
+
+# Header of the feature columns of CareerRecommenderDataset.csv, in feature order
+DATASET_FEATURE_COLUMNS = tuple(DATASET_COLUMN_NAMES.get(interest, interest) for interest in INTERESTS_LIST)
+
+
+def split_career_options(career_options):
+    """Split a comma-separated Career_Options cell into career names"""
+    if not isinstance(career_options, str):
+        return []
+    return [career.strip() for career in career_options.split(',') if career.strip()]
+
+
+def load_training_data(path=DATASET_PATH):
+    """Load the cleaned dataset as a uint8 feature matrix, course labels and career label lists"""
+    df = pd.read_csv(path)
+    
+    feature_matrix = df.iloc[:, :NUM_FEATURES].to_numpy(dtype=np.uint8)
+    courses = df['Courses'].tolist()
+    careers = [split_career_options(value) for value in df['Career_Options']]
+    
+    return feature_matrix, courses, careers
+
+
+def collapse_profiles(feature_matrix, courses, careers):
+    """Group identical interest vectors, returning packed patterns with row counts and label frequencies"""
+    packed_rows = pack_features(feature_matrix)
+    patterns, inverse = np.unique(packed_rows, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    
+    row_counts = np.bincount(inverse, minlength=len(patterns))
+    course_counts = [Counter() for _ in range(len(patterns))]
+    career_counts = [Counter() for _ in range(len(patterns))]
+    
+    for pattern_idx, course, row_careers in zip(inverse, courses, careers):
+        course_counts[pattern_idx][course] += 1
+        career_counts[pattern_idx].update(row_careers)
+    
+    return patterns, row_counts, course_counts, career_counts
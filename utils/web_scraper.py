@@ -1,41 +1,453 @@
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
 import streamlit as st
 import re
+import os
+import codecs
+import json
+import time
+import hashlib
+import threading
+from functools import lru_cache
+from html.parser import HTMLParser
+from concurrent.futures import ThreadPoolExecutor, wait
 
-def get_website_text_content(url: str) -> str:
-    """
-    This function takes a url and returns the main text content of the website.
-    The text content is extracted using BeautifulSoup and easier to understand.
-    The results is not directly readable, better to be summarized by LLM before consume
-    by the user.
+# Set headers to mimic a real browser
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+# Seconds allowed for a single request, and for a whole fan-out over several sources
+REQUEST_TIMEOUT = 10
+FETCH_DEADLINE = 4.0
+
+# Bytes read from the network per step of the streaming extractor
+STREAM_CHUNK_SIZE = 16 * 1024
+
+# Hosts kept in the pool, and keep-alive connections held open per host
+POOL_HOSTS = 16
+CONNECTIONS_PER_HOST = 4
+
+# Fetches run here so a slow source never holds up the caller past its deadline
+_fetch_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="web-fetch")
+
+
+# News sources per industry, also crawled into the offline content index
+INDUSTRY_SOURCES = {
+    'technology': ['https://techcrunch.com', 'https://arstechnica.com'],
+    'healthcare': ['https://www.modernhealthcare.com'],
+    'business': ['https://www.businessinsider.com'],
+    'education': ['https://www.edweek.org']
+}
+
+# Extracted page text kept on disk between runs
+DEFAULT_CACHE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "web_cache"
+)
+
+# Seconds a cached page is served without asking the server, and total size kept on disk
+CACHE_FRESH_FOR = 24 * 3600
+CACHE_MAX_BYTES = 50 * 1024 * 1024
+
+
+class PageCache:
+    """Extracted page text on disk, keyed by URL, with the validators needed to revalidate it
+    
+    Each entry is one JSON file; its modification time records the last use, so the least
+    recently used entries are evicted first once the directory grows past max_bytes.
     """
-    try:
-        # Set headers to mimic a real browser
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
+    
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=CACHE_MAX_BYTES, fresh_for=CACHE_FRESH_FOR):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.fresh_for = fresh_for
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
         
-        # Send a request to the website
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
+        # File name -> [size, last use], so eviction never has to rescan the directory
+        self._files = {}
+        for name in os.listdir(directory):
+            if name.endswith('.json'):
+                stat = os.stat(os.path.join(directory, name))
+                self._files[name] = [stat.st_size, stat.st_mtime]
+        self.total_bytes = sum(size for size, _ in self._files.values())
+    
+    def _name(self, url):
+        return hashlib.sha256(url.encode('utf-8')).hexdigest() + '.json'
+    
+    def get(self, url):
+        """Cached entry of a URL (text, etag, last_modified, fetched_at), or None"""
+        name = self._name(url)
+        path = os.path.join(self.directory, name)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get('url') != url:
+            return None
         
-        # Parse the HTML content
-        soup = BeautifulSoup(response.content, 'html.parser')
+        self._touch(name, path)
+        return entry
+    
+    def is_fresh(self, entry):
+        return time.time() - entry['fetched_at'] < self.fresh_for
+    
+    def put(self, url, text, etag=None, last_modified=None):
+        """Store a page's text and validators, then evict least recently used entries over the size cap"""
+        name = self._name(url)
+        path = os.path.join(self.directory, name)
+        data = json.dumps({
+            'url': url,
+            'text': text,
+            'etag': etag,
+            'last_modified': last_modified,
+            'fetched_at': time.time()
+        }).encode('utf-8')
         
-        # Remove script and style elements
-        for script in soup(["script", "style"]):
-            script.decompose()
+        # Write to a temporary file first so readers never see a partial entry
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
         
-        # Get text content
-        text = soup.get_text()
+        with self._lock:
+            previous = self._files.get(name)
+            self.total_bytes += len(data) - (previous[0] if previous else 0)
+            self._files[name] = [len(data), time.time()]
+            self._evict()
+    
+    def mark_revalidated(self, url, entry):
+        """Restart the freshness period of an entry the server confirmed unchanged"""
+        self.put(url, entry['text'], entry.get('etag'), entry.get('last_modified'))
+    
+    def _touch(self, name, path):
+        now = time.time()
+        try:
+            os.utime(path, (now, now))
+        except OSError:
+            return
+        with self._lock:
+            if name in self._files:
+                self._files[name][1] = now
+    
+    def _evict(self):
+        if self.total_bytes <= self.max_bytes:
+            return
+        for name in sorted(self._files, key=lambda name: self._files[name][1]):
+            if self.total_bytes <= self.max_bytes:
+                break
+            size, _ = self._files.pop(name)
+            self.total_bytes -= size
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+    
+    def stats(self):
+        return {'entries': len(self._files), 'bytes': self.total_bytes, 'max_bytes': self.max_bytes}
+
+
+@lru_cache(maxsize=None)
+def get_page_cache(directory=DEFAULT_CACHE_DIR):
+    """Return the page cache for a directory, creating it once per process"""
+    return PageCache(directory)
+
+
+@lru_cache(maxsize=None)
+def get_session():
+    """Return the shared HTTP session, whose connections are kept alive and reused across fetches"""
+    session = requests.Session()
+    session.headers.update(DEFAULT_HEADERS)
+    # pool_block makes extra concurrent requests to one host wait for a connection instead of opening more
+    adapter = HTTPAdapter(pool_connections=POOL_HOSTS, pool_maxsize=CONNECTIONS_PER_HOST, pool_block=True)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+# Characters str.splitlines() treats as line boundaries
+_LINE_BREAKS = "\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029"
+
+
+class _TextCollector(HTMLParser):
+    """Collects the text of an HTML stream, dropping the content of script and style elements
+    
+    Like BeautifulSoup's tree builder, a text node of nothing but whitespace becomes a single
+    newline (if it contains one) or space, except inside pre and textarea.
+    """
+    
+    SKIPPED_TAGS = ('script', 'style')
+    PRESERVE_WHITESPACE_TAGS = ('pre', 'textarea')
+    SPACES = " \n\t\x0c\r"
+    
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.pending = []
+        self._skip_depth = 0
+        self._preserve_depth = 0
+        # Leading whitespace of the current text node, held until it is known not to be all whitespace
+        self._whitespace = []
+        self._node_has_text = False
+    
+    def _end_node(self):
+        if self._whitespace and not self._node_has_text:
+            whitespace = "".join(self._whitespace)
+            if not self._preserve_depth:
+                whitespace = "\n" if "\n" in whitespace else " "
+            self.pending.append(whitespace)
+        self._whitespace = []
+        self._node_has_text = False
+    
+    def handle_starttag(self, tag, attrs):
+        self._end_node()
+        if tag in self.SKIPPED_TAGS:
+            self._skip_depth += 1
+        elif tag in self.PRESERVE_WHITESPACE_TAGS:
+            self._preserve_depth += 1
+    
+    def handle_endtag(self, tag):
+        self._end_node()
+        if tag in self.SKIPPED_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+        elif tag in self.PRESERVE_WHITESPACE_TAGS and self._preserve_depth:
+            self._preserve_depth -= 1
+    
+    def handle_comment(self, data):
+        self._end_node()
+    
+    def handle_decl(self, decl):
+        self._end_node()
+    
+    def handle_pi(self, data):
+        self._end_node()
+    
+    def unknown_decl(self, data):
+        self._end_node()
+    
+    def handle_data(self, data):
+        if self._skip_depth:
+            return
+        if self._node_has_text:
+            self.pending.append(data)
+        elif data.strip(self.SPACES):
+            self.pending.extend(self._whitespace)
+            self.pending.append(data)
+            self._whitespace = []
+            self._node_has_text = True
+        else:
+            self._whitespace.append(data)
+    
+    def close(self):
+        super().close()
+        self._end_node()
+    
+    def take(self):
+        text = "".join(self.pending)
+        self.pending.clear()
+        return text
+
+
+def _phrases(text):
+    """Non-empty stripped phrases of text split on double spaces"""
+    for phrase in text.split("  "):
+        phrase = phrase.strip()
+        if phrase:
+            yield phrase
+
+
+def iter_text_chunks(pieces, encoding='utf-8'):
+    """Yield the readable text of an HTML document fed as successive str or bytes pieces
+    
+    Script and style content is skipped as it streams past, and text is split into
+    stripped phrases at line breaks and double spaces as soon as each one is complete,
+    so only the current unfinished phrase is held in memory. Joining the chunks with
+    single spaces gives the normalized page text.
+    """
+    decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+    parser = _TextCollector()
+    partial = ""
+    
+    for piece in pieces:
+        parser.feed(decoder.decode(piece) if isinstance(piece, bytes) else piece)
+        lines = (partial + parser.take()).splitlines(keepends=True)
         
-        # Clean up the text
-        lines = (line.strip() for line in text.splitlines())
-        chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-        text = ' '.join(chunk for chunk in chunks if chunk)
+        # The last line may continue in the next piece; its finished phrases can go out already
+        partial = ""
+        if lines and lines[-1][-1] not in _LINE_BREAKS:
+            phrases = lines.pop().split("  ")
+            partial = phrases.pop()
+            lines.append("  ".join(phrases))
         
-        return text
+        for line in lines:
+            yield from _phrases(line)
+    
+    parser.feed(decoder.decode(b"", final=True))
+    parser.close()
+    for line in (partial + parser.take()).splitlines():
+        yield from _phrases(line)
+
+
+def iter_sentences(chunks):
+    """Yield the '.'-separated sentences of a text given as chunks that join with single spaces"""
+    buffer = ""
+    for index, chunk in enumerate(chunks):
+        buffer = f"{buffer} {chunk}" if index else chunk
+        start = 0
+        end = buffer.find('.')
+        while end != -1:
+            yield buffer[start:end]
+            start = end + 1
+            end = buffer.find('.', start)
+        buffer = buffer[start:]
+    yield buffer
+
+
+def extract_text(html):
+    """Readable text of an HTML document, without scripts and styles, as one whitespace-normalized string"""
+    return ' '.join(iter_text_chunks([html]))
+
+
+def _response_encoding(response):
+    """Charset declared by a response, or UTF-8 when it declares none or an unknown one"""
+    if 'charset=' in response.headers.get('Content-Type', '').lower() and response.encoding:
+        try:
+            return codecs.lookup(response.encoding).name
+        except LookupError:
+            pass
+    return 'utf-8'
+
+
+def iter_page_text(url, timeout=REQUEST_TIMEOUT, session=None):
+    """Stream the text chunks of a page as it downloads; stop iterating to abandon the rest of the page"""
+    with (session or get_session()).get(url, timeout=timeout, stream=True) as response:
+        response.raise_for_status()
+        yield from iter_text_chunks(response.iter_content(STREAM_CHUNK_SIZE), _response_encoding(response))
+
+
+def fetch_text(url, timeout=REQUEST_TIMEOUT, session=None, cache=None, revalidate=False):
+    """Text of a page, from the page cache when fresh, else downloaded through the pooled session
+    
+    Stale entries are revalidated with a conditional GET and still served when the server
+    cannot be reached. Raises requests.RequestException when there is nothing to serve.
+    Pass revalidate=True to treat every cached entry as stale, or cache=False to always download.
+    """
+    if cache is None:
+        cache = get_page_cache()
+    
+    entry = cache.get(url) if cache else None
+    if entry is not None and not revalidate and cache.is_fresh(entry):
+        return entry['text']
+    
+    headers = {}
+    if entry is not None:
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+    
+    try:
+        with (session or get_session()).get(url, headers=headers, timeout=timeout, stream=True) as response:
+            if response.status_code == 304 and entry is not None:
+                cache.mark_revalidated(url, entry)
+                return entry['text']
+            response.raise_for_status()
+            text = ' '.join(iter_text_chunks(response.iter_content(STREAM_CHUNK_SIZE), _response_encoding(response)))
+    except requests.RequestException:
+        if entry is not None:
+            return entry['text']
+        raise
+    
+    if cache:
+        cache.put(url, text, response.headers.get('ETag'), response.headers.get('Last-Modified'))
+    return text
+
+
+def fan_out(function, urls, deadline=FETCH_DEADLINE):
+    """Run function(url) for every URL on the fetch pool; {url: result} of the calls that succeeded within deadline
+    
+    Late calls finish in the background and their results are discarded.
+    """
+    urls = list(dict.fromkeys(urls))
+    futures = {_fetch_executor.submit(function, url): url for url in urls}
+    done, _ = wait(futures, timeout=deadline)
+    
+    results = {}
+    for future in done:
+        if future.exception() is None:
+            results[futures[future]] = future.result()
+    return {url: results[url] for url in urls if url in results}
+
+
+def fetch_all(urls, deadline=FETCH_DEADLINE, timeout=REQUEST_TIMEOUT, session=None, cache=None, revalidate=False):
+    """Fetch every URL concurrently and return {url: text} for the pages available within deadline seconds
+    
+    A page still being revalidated at the deadline is served from the page cache; failed
+    and late pages without a cached copy are left out. Late fetches finish in the
+    background and refresh the cache for next time.
+    """
+    if cache is None:
+        cache = get_page_cache()
+    
+    timeout = min(timeout, deadline)
+    results = fan_out(lambda url: fetch_text(url, timeout, session, cache, revalidate), urls, deadline)
+    
+    if cache:
+        for url in dict.fromkeys(urls):
+            if url not in results:
+                entry = cache.get(url)
+                if entry is not None:
+                    results[url] = entry['text']
+    
+    return {url: results[url] for url in dict.fromkeys(urls) if url in results}
+
+
+# URLs with a background revalidation in flight, so concurrent questions start only one
+_revalidating = set()
+_revalidating_lock = threading.Lock()
+
+
+def _revalidate(url, timeout, session, cache):
+    try:
+        fetch_text(url, timeout, session, cache)
+    finally:
+        with _revalidating_lock:
+            _revalidating.discard(url)
+
+
+def stream_text(url, timeout=REQUEST_TIMEOUT, session=None, cache=None):
+    """Yield the text chunks of a page: the cached text when there is any, else the page as it downloads
+    
+    A stale cached page is served at once and revalidated in the background. A page missing
+    from the cache is streamed through iter_page_text, so a consumer that stops early abandons
+    the rest of the download; such partial reads are not cached.
+    """
+    if cache is None:
+        cache = get_page_cache()
+    
+    entry = cache.get(url) if cache else None
+    if entry is None:
+        yield from iter_page_text(url, timeout, session)
+        return
+    
+    if not cache.is_fresh(entry):
+        with _revalidating_lock:
+            start = url not in _revalidating
+            _revalidating.add(url)
+        if start:
+            _fetch_executor.submit(_revalidate, url, timeout, session, cache)
+    yield entry['text']
+
+
+def get_website_text_content(url: str) -> str:
+    """
+    This function takes a url and returns the main text content of the website.
+    The text content is extracted with a streaming HTML parser and easier to understand.
+    The results is not directly readable, better to be summarized by LLM before consume
+    by the user.
+    """
+    try:
+        return fetch_text(url)
         
     except requests.RequestException as e:
         return f"Error fetching content: {str(e)}"
@@ -62,14 +474,7 @@ def get_industry_news(industry: str) -> list:
     """
     try:
         # This could be enhanced with RSS feeds or news APIs
-        industry_sources = {
-            'technology': ['https://techcrunch.com', 'https://arstechnica.com'],
-            'healthcare': ['https://www.modernhealthcare.com'],
-            'business': ['https://www.businessinsider.com'],
-            'education': ['https://www.edweek.org']
-        }
-        
-        if industry.lower() in industry_sources:
+        if industry.lower() in INDUSTRY_SOURCES:
             return [f"Industry news sources available for {industry}"]
         else:
             return ["General industry news sources available"]